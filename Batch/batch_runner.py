@@ -0,0 +1,129 @@
+import contextlib
+import multiprocessing
+import os
+import signal
+import time
+
+import rpal
+from CSEMachine.memo_cache import MemoCache
+
+# Seconds a single program may run before it is reported as timed out
+DEFAULT_TIMEOUT = 10.0
+
+# Optimization passes by command line flag, in the order myrpal.py runs them
+PASSES = tuple(("--" + name, optimizer) for name, optimizer in rpal.PASSES.items())
+
+
+class ProgramTimeout(Exception):
+    pass
+
+
+def collect_programs(paths):
+    """Expands files, directories (their .rpal files) and @manifest files (one path per line) in order."""
+    programs = []
+    for path in paths:
+        if path.startswith("@"):
+            manifest = path[1:]
+            base = os.path.dirname(manifest)
+            try:
+                with open(manifest, "r") as file:
+                    entries = [line.strip() for line in file]
+            except OSError:
+                # Kept as a program, so it gets an error record like any other path that cannot be read
+                programs.append(manifest)
+                continue
+            programs.extend(collect_programs(
+                os.path.join(base, entry) for entry in entries if entry and not entry.startswith("#")
+            ))
+        elif os.path.isdir(path):
+            programs.extend(sorted(
+                os.path.join(path, name) for name in os.listdir(path) if name.endswith(".rpal")
+            ))
+        else:
+            programs.append(path)
+    return programs
+
+
+def run_source(source, passes=(), memoize=False):
+    """Compiles and runs one RPAL program and returns its result as RPAL text."""
+    program = rpal.compile(source, [flag[2:] for flag in passes])
+    return program.get_answer(MemoCache() if memoize else None)
+
+
+def raise_timeout(signum, frame):
+    raise ProgramTimeout()
+
+
+@contextlib.contextmanager
+def time_limit(seconds):
+    """Raises ProgramTimeout in the block once seconds have passed; no limit for None or 0.
+    SIGALRM interrupts the machine wherever it is, but only exists on Unix and can only be handled
+    in the main thread; elsewhere the block runs unbounded."""
+    if not seconds or not hasattr(signal, "setitimer"):
+        yield
+        return
+    previous = signal.signal(signal.SIGALRM, raise_timeout)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def run_task(task):
+    """Runs one (index, path, passes, memoize, timeout) task and returns its JSON-ready record."""
+    index, path, passes, memoize, timeout = task
+    record = {"index": index, "path": path, "status": None}
+    start = time.perf_counter()
+    try:
+        with time_limit(timeout), open(path, "r") as source:
+            record["result"] = run_source(source, passes, memoize)
+        record["status"] = "ok"
+    except ProgramTimeout:
+        record["status"] = "timeout"
+        record["error"] = f"timed out after {timeout:g}s"
+    except Exception as e:
+        record["status"] = "error"
+        record["error"] = f"{type(e).__name__}: {e}"
+    record["seconds"] = round(time.perf_counter() - start, 6)
+    return record
+
+
+class BatchRunner:
+    """
+    Runs many RPAL programs in one process or across a multiprocessing pool.
+    Each program is compiled and executed independently, with the same optimization passes and
+    memoization setting, and produces a record: its index in the input, its path, a status
+    ('ok', 'error' or 'timeout'), the result or the error, and the seconds it took. Records are
+    yielded as soon as they are available, either in input order or in completion order.
+    Programs are dispatched one at a time, so a slow program only holds up its own worker.
+    Attributes:
+        jobs (int): Number of worker processes, by default one per core; 1 runs every program in the calling process
+        timeout (float): Seconds a program may run, or None for no limit
+        ordered (bool): Whether records are yielded in input order rather than as completed
+        passes (tuple): Optimization pass flags ('--inline', '--fold', '--dce') to apply
+        memoize (bool): Whether programs run with a memo cache
+    Methods:
+        run(paths): Runs the programs named by paths and yields their records
+    """
+    def __init__(self, jobs=None, timeout=DEFAULT_TIMEOUT, ordered=True, passes=(), memoize=False):
+        if jobs is not None and jobs < 1:
+            raise ValueError(f"jobs must be at least 1, not {jobs}")
+        self.jobs = jobs or os.cpu_count() or 1
+        self.timeout = timeout
+        self.ordered = ordered
+        self.passes = tuple(passes)
+        self.memoize = memoize
+
+    def run(self, paths):
+        tasks = [
+            (index, path, self.passes, self.memoize, self.timeout)
+            for index, path in enumerate(collect_programs(paths))
+        ]
+        if self.jobs == 1 or len(tasks) <= 1:
+            yield from map(run_task, tasks)
+            return
+        with multiprocessing.Pool(min(self.jobs, len(tasks))) as pool:
+            results = pool.imap if self.ordered else pool.imap_unordered
+            yield from results(run_task, tasks, chunksize=1)
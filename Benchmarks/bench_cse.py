@@ -0,0 +1,77 @@
+import time
+
+from LexicalAnalyzer.lexical_analyzer import tokenize
+from Parser.parser import Parser
+from Standardizer.standardizer import ASTFactory
+from CSEMachine.CSEM import CSEMachineFactory
+
+
+def wide_tuple(n):
+    """A tuple of n sums: every evaluated element stays on the stack until the final tau."""
+    return "Order (" + ", ".join(f"{i} + 1" for i in range(n)) + ")"
+
+
+def aug_loop(n):
+    """Builds an n-element tuple with aug in a tail-recursive loop, then selects from it."""
+    return (f"let rec build n t = n eq 0 -> t | build (n - 1) (t aug n) "
+            f"within t = build {n} nil in (Order t, t 1, t {n})")
+
+
+def string_walk(n):
+    """Walks an n-character string with Stem and Stern, counting one of its letters."""
+    return (f"let rec count s n = s eq '' -> n | count (Stern s) (Stem s eq 'a' -> n + 1 | n) "
+            f"in count '{'ab' * (n // 2)}' 0")
+
+
+def build_machine(source):
+    ast = ASTFactory().get_abstract_syntax_tree(Parser(tokenize(source)).parse())
+    ast.standardize()
+    return CSEMachineFactory().get_cse_machine(ast)
+
+
+def count_steps(machine):
+    """Counts the instructions executed by wrapping every handler in the machine's dispatch table."""
+    steps = 0
+
+    def counting(handler):
+        def wrapper(symbol):
+            nonlocal steps
+            steps += 1
+            handler(symbol)
+        return wrapper
+
+    machine.handlers = [counting(handler) for handler in machine.handlers]
+    machine.execute()
+    return steps
+
+
+def time_execute(source, repeat=3):
+    best = None
+    for _ in range(repeat):
+        machine = build_machine(source)
+        start = time.perf_counter()
+        machine.execute()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return count_steps(build_machine(source)), best
+
+
+def main():
+    print(f"{'depth':>10} {'steps':>10} {'seconds':>10} {'us/step':>10}")
+    for depth in (1_000, 2_000, 4_000, 8_000, 16_000):
+        steps, elapsed = time_execute(wide_tuple(depth))
+        print(f"{depth:>10} {steps:>10} {elapsed:>10.4f} {elapsed / steps * 1e6:>10.3f}")
+    print()
+    print(f"{'aug':>10} {'steps':>10} {'seconds':>10} {'us/step':>10}")
+    for length in (25_000, 50_000, 100_000):
+        steps, elapsed = time_execute(aug_loop(length))
+        print(f"{length:>10} {steps:>10} {elapsed:>10.4f} {elapsed / steps * 1e6:>10.3f}")
+    print()
+    print(f"{'string':>10} {'steps':>10} {'seconds':>10} {'us/step':>10}")
+    for length in (25_000, 50_000, 100_000):
+        steps, elapsed = time_execute(string_walk(length))
+        print(f"{length:>10} {steps:>10} {elapsed:>10.4f} {elapsed / steps * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+import glob
+import os
+import time
+
+from LexicalAnalyzer.lexical_analyzer import tokenize
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Tests")
+
+
+def load_corpus(target_bytes):
+    """
+    Concatenates the programs in Tests/ until the corpus reaches target_bytes.
+    The programs are only lexed, so the result does not need to be a valid RPAL program.
+    """
+    sources = []
+    for path in sorted(glob.glob(os.path.join(TESTS_DIR, "*.rpal"))):
+        with open(path, "r") as file:
+            sources.append(file.read())
+    chunk = "\n".join(sources) + "\n"
+    return chunk * max(1, target_bytes // len(chunk))
+
+
+def time_tokenize(source, repeat=3):
+    best = None
+    n_tokens = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        n_tokens = len(tokenize(source))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return n_tokens, best
+
+
+def main():
+    print(f"{'bytes':>10} {'tokens':>10} {'seconds':>10} {'MB/s':>10}")
+    for target_bytes in (250_000, 1_000_000, 4_000_000):
+        source = load_corpus(target_bytes)
+        n_tokens, elapsed = time_tokenize(source)
+        print(f"{len(source):>10} {n_tokens:>10} {elapsed:>10.4f} {len(source) / elapsed / 1e6:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
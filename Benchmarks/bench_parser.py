@@ -0,0 +1,38 @@
+import time
+
+from LexicalAnalyzer.lexical_analyzer import tokenize
+from Parser.parser import Parser
+
+
+def generate_source(n_elements):
+    """
+    Generates an RPAL program whose body is one wide tuple, so the token count grows
+    with n_elements while the parser's recursion depth stays constant.
+    Each tuple element is 'f <i> + <i> * 2', i.e. 6 tokens plus the separating comma.
+    """
+    elements = ", ".join(f"f {i} + {i} * 2" for i in range(n_elements))
+    return f"let f x = x + 1 in ({elements})"
+
+
+def time_parse(source, repeat=3):
+    best = None
+    n_tokens = 0
+    for _ in range(repeat):
+        tokens = tokenize(source)
+        n_tokens = len(tokens)
+        start = time.perf_counter()
+        Parser(tokens).parse()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return n_tokens, best
+
+
+def main():
+    print(f"{'tokens':>10} {'seconds':>10} {'us/token':>10}")
+    for n_elements in (1_000, 2_000, 4_000, 8_000, 16_000):
+        n_tokens, elapsed = time_parse(generate_source(n_elements))
+        print(f"{n_tokens:>10} {elapsed:>10.4f} {elapsed / n_tokens * 1e6:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,30 @@
 #Create CSE machine to flatten the ST and simulate execution
+import sys
+from enum import IntEnum
+
+from CSEMachine.memo_cache import MAX_KEY_ITEMS
+from Parser.node import NodeType
+from Standardizer.resolver import Resolver
+
+# Each control symbol class carries an opcode; CSEMachine.execute() indexes its handler table with it
+class Opcode(IntEnum):
+    PUSH = 0
+    ID = 1
+    LAMBDA = 2
+    GAMMA = 3
+    RETURN = 4
+    UNOP = 5
+    BINOP = 6
+    BETA = 7
+    TAU = 8
+    JUMP = 9
+    REC = 10
+    MEMO = 11
+
 # -------------------NODES --------------------
 class Symbol:
+    opcode = Opcode.PUSH
+
     def __init__(self, data):
         self.data = data
 
@@ -10,6 +34,9 @@ class Symbol:
     def get_data(self):
         return self.data
 
+    def equals(self, other):
+        return type(self) is type(other) and self.get_data() == other.get_data()
+
 class Rand(Symbol):
     def __init__(self, data):
         super().__init__(data)
@@ -18,28 +45,62 @@ class Rator(Symbol):
     def __init__(self, data):
         super().__init__(data)
 
-class B(Symbol):
-    def __init__(self):
-        super().__init__("b")
-        self.symbols = []
-
 class Beta(Symbol):
+    # Conditional jump: pops the condition and continues at target when it is false
+    opcode = Opcode.BETA
+
     def __init__(self):
         super().__init__("beta")
+        self.target = None
+
+    def set_target(self, target):
+        self.target = target
+
+    def get_target(self):
+        return self.target
 
 class Bool(Rand):
     def __init__(self, data):
         super().__init__(data)
 
+class Builtin(Symbol):
+    # A primitive function. Each application supplies one argument; the handler runs once arity
+    # of them have been collected, so primitives such as Conc are curried like lambdas.
+    def __init__(self, data, arity, handler, args=()):
+        super().__init__(data)
+        self.arity = arity
+        self.handler = handler
+        self.args = args
+
+    def get_arity(self):
+        return self.arity
+
+    def apply(self, arg):
+        # Returns the result once the last argument is in, otherwise the partial application
+        args = self.args + (arg,)
+        if len(args) == self.arity:
+            return self.handler(*args)
+        return Builtin(self.data, self.arity, self.handler, args)
+
+    def equals(self, other):
+        raise TypeError("functions cannot be compared")
+
 class Bop(Rator):
+    opcode = Opcode.BINOP
+
     def __init__(self, data):
         super().__init__(data)
+        self.operation = BINARY_OPERATIONS[data]
 
 class Uop(Rator):
+    opcode = Opcode.UNOP
+
     def __init__(self, data):
         super().__init__(data)
+        self.operation = UNARY_OPERATIONS[data]
 
 class Delta(Symbol):
+    # The flat instruction array of one lambda body (or of the whole program), in execution order
     def __init__(self, i):
         super().__init__("delta")
         self.index = i
@@ -60,8 +121,7 @@ class E(Symbol):
         super().__init__("e")
         self.index = i
         self.parent = None
-        self.is_removed = False
-        self.values = {}
+        self.values = []
 
     def set_parent(self, e):
         self.parent = e
@@ -75,20 +135,12 @@ class E(Symbol):
     def get_index(self):
         return self.index
 
-    def set_is_removed(self, is_removed):
-        self.is_removed = is_removed
-
-    def get_is_removed(self):
-        return self.is_removed
-
     def lookup(self, id):
-        for key in self.values:
-            if key.get_data() == id.get_data():
-                return self.values[key]
-        if self.parent is not None:
-            return self.parent.lookup(id)
-        else:
-            return Symbol(id.get_data())
+        # values is a slot array; the Resolver gave each identifier a fixed frame depth and slot
+        env = self
+        for _ in range(id.depth):
+            env = env.parent
+        return env.values[id.slot]
 
 class Err(Symbol):
     def __init__(self):
@@ -123,29 +175,135 @@ class Eta(Symbol):
     def get_lambda(self):
         return self.lambda_
 
+    def equals(self, other):
+        raise TypeError("functions cannot be compared")
+
 class Gamma(Symbol):
+    opcode = Opcode.GAMMA
+
     def __init__(self):
         super().__init__("gamma")
 
+class Jump(Symbol):
+    opcode = Opcode.JUMP
+
+    def __init__(self):
+        super().__init__("jump")
+        self.target = None
+
+    def set_target(self, target):
+        self.target = target
+
+    def get_target(self):
+        return self.target
+
+class Memo(Symbol):
+    # Run when a memoized application returns: caches the result on top of the stack under key
+    opcode = Opcode.MEMO
+
+    def __init__(self, key):
+        super().__init__("memo")
+        self.key = key
+
+    def get_key(self):
+        return self.key
+
+class Rec(Symbol):
+    # 'rec f = fn ...' lowered to a self-referential closure: the lambda is bound in a new frame
+    # whose only slot, f, holds the resulting closure itself
+    opcode = Opcode.REC
+
+    def __init__(self, lambda_):
+        super().__init__("rec")
+        self.lambda_ = lambda_
+
+    def get_lambda(self):
+        return self.lambda_
+
+class Return(Symbol):
+    # Ends every instruction array; resumes the caller saved on the control stack
+    opcode = Opcode.RETURN
+
+    def __init__(self):
+        super().__init__("return")
+
 class Id(Rand):
-    def __init__(self, data):
+    opcode = Opcode.ID
+
+    def __init__(self, data, depth=0, slot=0):
         super().__init__(data)
+        self.depth = depth
+        self.slot = slot
 
 class Int(Rand):
     def __init__(self, data):
         super().__init__(data)
 
 class Str(Rand):
-    def __init__(self, data):
+    # An immutable string: the text of data from offset start on. Stern returns a view of the same
+    # text one character further, and Conc a rope whose parts are its two operands; a rope is
+    # flattened into a single text the first time its characters are needed.
+    def __init__(self, data, start=0):
         super().__init__(data)
+        self.start = start
+        self.length = len(data) - start
+        self.parts = None
+
+    @classmethod
+    def concat(cls, left, right):
+        rope = cls("")
+        rope.parts = (left, right)
+        rope.length = left.length + right.length
+        return rope
+
+    def flatten(self):
+        if self.parts is None:
+            return
+        pieces = []
+        pending = [self]
+        while pending:
+            node = pending.pop()
+            if node.parts is not None:
+                pending.append(node.parts[1])
+                pending.append(node.parts[0])
+            else:
+                pieces.append(node.data[node.start:] if node.start else node.data)
+        self.data = "".join(pieces)
+        self.start = 0
+        self.parts = None
+
+    def get_data(self):
+        self.flatten()
+        return self.data[self.start:] if self.start else self.data
+
+    def get_length(self):
+        return self.length
+
+    def get_first(self):
+        self.flatten()
+        return Str(self.data[self.start])
+
+    def get_rest(self):
+        self.flatten()
+        return Str(self.data, min(self.start + 1, len(self.data)))
+
+    def equals(self, other):
+        # Lengths are known without flattening, so comparing against '' is O(1)
+        return type(other) is Str and self.length == other.length and \
+            (self.length == 0 or self.get_data() == other.get_data())
 
 class Lambda(Symbol):
+    opcode = Opcode.LAMBDA
+
     def __init__(self, i):
         super().__init__("lambda")
         self.index = i
         self.environment = None
         self.identifiers = []
         self.delta = None
+        # Key prefix of applications cached in --memoize mode: (closure,) for a rec-bound closure,
+        # extended with each argument for the closures its curried applications return; None otherwise
+        self.memo_prefix = None
 
     def set_environment(self, n):
         self.environment = n
@@ -162,7 +320,20 @@ class Lambda(Symbol):
     def get_index(self):
         return self.index
 
+    def bind(self, environment):
+        # A closure: the shared control-structure lambda paired with the frame it was evaluated in
+        closure = Lambda(self.index)
+        closure.identifiers = self.identifiers
+        closure.delta = self.delta
+        closure.environment = environment
+        return closure
+
+    def equals(self, other):
+        raise TypeError("functions cannot be compared")
+
 class Tau(Symbol):
+    opcode = Opcode.TAU
+
     def __init__(self, n):
         super().__init__("tau")
         self.n = n
@@ -171,14 +342,198 @@ class Tau(Symbol):
         return self.n
 
 class Tup(Rand):
-    def __init__(self):
+    # An immutable tuple: the first `length` entries of `items`. Versions built from one another
+    # by aug share the items list; a version only appends in place when it owns the end of the
+    # list, so older versions (and the nil a control structure pushes every time) never change.
+    def __init__(self, items=None):
         super().__init__("tuple")
-        self.symbols = []
+        self.items = [] if items is None else items
+        self.length = len(self.items)
+
+    def get_length(self):
+        return self.length
+
+    def get_item(self, i):
+        if not 1 <= i <= self.length:
+            raise IndexError(f"tuple index {i} out of range")
+        return self.items[i - 1]
+
+    def get_items(self, n=None):
+        return self.items[:self.length if n is None else min(n, self.length)]
+
+    def append(self, value):
+        return self.extend((value,))
+
+    def extend(self, values):
+        items = self.items
+        if len(items) != self.length or not self.length:
+            # Another version has already grown the shared list: branch off a copy of this one.
+            # Empty tuples are nil literals shared by every run of the program, so they are never grown
+            items = items[:self.length]
+        items.extend(values)
+        return Tup(items)
+
+    def equals(self, other):
+        # Component by component, so tuples compare by contents rather than by their "tuple" tag
+        if type(other) is not Tup or self.length != other.length:
+            return False
+        return all(item.equals(other_item) for item, other_item in zip(self.get_items(), other.get_items()))
 
 class Ystar(Symbol):
     def __init__(self):
         super().__init__("<Y*>")
 
+# -------------------- OPERATIONS --------------------
+# Operators and builtins are plain functions over values. Bop/Uop symbols pick theirs up when
+# the factory builds them; builtins are wrapped in Builtin symbols the factory compiles in as constants.
+# Operand types are checked on the symbols: bool is a subclass of int, so the Python payloads alone
+# would let truth values into arithmetic and integers into logic.
+def get_operands(operand_type, operator, *rands):
+    for rand in rands:
+        if type(rand) is not operand_type:
+            raise TypeError(f"'{operator}' expects {'integers' if operand_type is Int else 'truth values'}")
+    return [rand.data for rand in rands]
+
+def op_neg(rand):
+    val, = get_operands(Int, "neg", rand)
+    return Int(-val)
+
+def op_not(rand):
+    val, = get_operands(Bool, "not", rand)
+    return Bool(not val)
+
+def op_add(rand1, rand2):
+    val1, val2 = get_operands(Int, "+", rand1, rand2)
+    return Int(val1 + val2)
+
+def op_sub(rand1, rand2):
+    val1, val2 = get_operands(Int, "-", rand1, rand2)
+    return Int(val1 - val2)
+
+def op_mul(rand1, rand2):
+    val1, val2 = get_operands(Int, "*", rand1, rand2)
+    return Int(val1 * val2)
+
+def divide(val1, val2):
+    # Integer division truncating towards zero, without going through float
+    quotient = val1 // val2
+    if quotient < 0 and quotient * val2 != val1:
+        quotient += 1
+    return quotient
+
+def op_div(rand1, rand2):
+    val1, val2 = get_operands(Int, "/", rand1, rand2)
+    return Int(divide(val1, val2))
+
+def op_pow(rand1, rand2):
+    val1, val2 = get_operands(Int, "**", rand1, rand2)
+    return Int(val1 ** val2)
+
+def op_and(rand1, rand2):
+    val1, val2 = get_operands(Bool, "&", rand1, rand2)
+    return Bool(val1 and val2)
+
+def op_or(rand1, rand2):
+    val1, val2 = get_operands(Bool, "or", rand1, rand2)
+    return Bool(val1 or val2)
+
+def op_eq(rand1, rand2):
+    return Bool(rand1.equals(rand2))
+
+def op_ne(rand1, rand2):
+    return Bool(not rand1.equals(rand2))
+
+def op_ls(rand1, rand2):
+    val1, val2 = get_operands(Int, "ls", rand1, rand2)
+    return Bool(val1 < val2)
+
+def op_le(rand1, rand2):
+    val1, val2 = get_operands(Int, "le", rand1, rand2)
+    return Bool(val1 <= val2)
+
+def op_gr(rand1, rand2):
+    val1, val2 = get_operands(Int, "gr", rand1, rand2)
+    return Bool(val1 > val2)
+
+def op_ge(rand1, rand2):
+    val1, val2 = get_operands(Int, "ge", rand1, rand2)
+    return Bool(val1 >= val2)
+
+def op_aug(rand1, rand2):
+    if isinstance(rand2, Tup):
+        return rand1.extend(rand2.get_items())
+    return rand1.append(rand2)
+
+UNARY_OPERATIONS = {
+    "neg": op_neg, "not": op_not
+}
+
+BINARY_OPERATIONS = {
+    "+": op_add, "-": op_sub, "*": op_mul, "/": op_div, "**": op_pow, "&": op_and, "or": op_or,
+    "eq": op_eq, "ne": op_ne, "ls": op_ls, "le": op_le, "gr": op_gr, "ge": op_ge, "aug": op_aug
+}
+
+def builtin_print(value):
+    # The driver prints the program's result, so Print only passes its argument through
+    return value
+
+def builtin_stem(s):
+    return s.get_first()
+
+def builtin_stern(s):
+    return s.get_rest()
+
+def builtin_conc(s1, s2):
+    return Str.concat(s1, s2)
+
+def builtin_order(tup):
+    return Int(tup.get_length())
+
+def builtin_null(tup):
+    return Bool(isinstance(tup, Tup) and tup.get_length() == 0)
+
+def builtin_itos(n):
+    return Str(str(n.get_data()))
+
+def builtin_isinteger(value):
+    return Bool(isinstance(value, Int))
+
+def builtin_isstring(value):
+    return Bool(isinstance(value, Str))
+
+def builtin_istuple(value):
+    return Bool(isinstance(value, Tup))
+
+def builtin_isdummy(value):
+    return Bool(isinstance(value, Dummy))
+
+def builtin_istruthvalue(value):
+    return Bool(isinstance(value, Bool))
+
+def builtin_isfunction(value):
+    return Bool(isinstance(value, (Lambda, Builtin, Eta)))
+
+# name -> (number of curried arguments, handler); the factory makes one Builtin for each entry
+BUILTINS = {
+    "Print": (1, builtin_print),
+    "print": (1, builtin_print),
+    "Stem": (1, builtin_stem),
+    "Stern": (1, builtin_stern),
+    "Conc": (2, builtin_conc),
+    "Order": (1, builtin_order),
+    "Null": (1, builtin_null),
+    "ItoS": (1, builtin_itos),
+    "Isinteger": (1, builtin_isinteger),
+    "Isstring": (1, builtin_isstring),
+    "Istuple": (1, builtin_istuple),
+    "Isdummy": (1, builtin_isdummy),
+    "Istruthvalue": (1, builtin_istruthvalue),
+    "Isfunction": (1, builtin_isfunction)
+}
+
+# Shared instruction array run when an Eta is applied
+ETA_CODE = [Gamma(), Gamma(), Return()]
+
 # -------------------- CSEMachine --------------------
 class CSEMachine:
     """
@@ -186,215 +541,277 @@ class CSEMachine:
     This class implements a virtual machine that evaluates functional programming constructs
     using three main components: Control (instructions to execute), Stack (operand storage),
     and Environment (variable bindings).
+    Control structures are flat instruction arrays (one per lambda) that are never copied: the
+    machine runs one array at a time with a program counter, conditionals are jumps, and a call
+    saves the caller's (array, pc, environment) on the control stack until the callee returns.
     Attributes:
-        control (list): Stack of control structures and instructions to be executed
-        stack (list): Stack for storing intermediate values and operands
-        environment (list): List of environment frames for variable lookup and scoping
+        control (list): Stack of suspended (instructions, pc, environment) frames to return to
+        code (list): The instruction array being executed
+        pc (int): Index of the next instruction in code
+        stack (list): Stack for storing intermediate values and operands; the top is the last element,
+            so pushes and pops are O(1)
+        environment (list): Holds the root environment frame. Other frames are only referenced by
+            closures, control markers and their child frames, so they are freed once unreachable
+        current_environment (E): The frame identifiers are currently looked up in
+        memo (MemoCache): Results of rec-bound closure applications, or None when not memoizing
+        handlers (list): Control symbol handlers indexed by Opcode
     Methods:
-        execute(): Main execution loop that processes control structures and manages the machine state
-        apply_unary_operation(rator, rand): Applies unary operators (neg, not) to operands
-        apply_binary_operation(rator, rand1, rand2): Applies binary operators (+, -, *, /, etc.) to operands
+        execute(): Main execution loop; dispatches each control symbol through the handler table by its opcode
+        call(code, environment): Saves the current frame on the control stack (unless it is a tail call)
+            and starts running code
+        execute_<opcode>(symbol): Handler for one kind of control symbol
+        apply_<kind>(rator): Handler for Gamma, chosen by the type of the operator on top of the stack
+            (lambda, tuple, builtin, Y*, eta)
+        apply_memoized_<kind>(rator): Gamma handlers used with a memo cache; they reuse the cached
+            result of a rec-bound function applied to equal arguments, all of them when it is curried
+        get_application_key(prefix): Returns the cache key of an application, or None if it is not cached
+        get_memo_key(value): Returns a hashable structural key for a value, or None if it has none
+        get_value(symbol): Formats a value's native payload (int, bool, str, tuple) as RPAL output
         get_tuple_value(tup): Recursively formats tuple values for output representation
         get_answer(): Executes the program and returns the final result
     Supported Operations:
         - Lambda expressions and function application (Gamma)
-        - Conditional expressions (Beta)
+        - Conditional expressions (Beta, Jump)
         - Tuple operations (Tau, tuple indexing)
-        - Built-in functions (Stem, Stern, Conc, Order, type checking functions)
+        - Built-in functions (Print, Stem, Stern, Conc, Order, Null, ItoS, type checking functions),
+          pushed as constant Builtin symbols and curried
         - Arithmetic and logical operations
         - Environment management and variable lookup
-        - Recursive functions via Y-combinator (Ystar, Eta)
+        - Recursive functions as self-referential closures (Rec), or via Y-combinator (Ystar, Eta)
+          when the body of a rec definition is not a lambda
     The machine handles various symbol types including identifiers, literals, operators,
     and control structures to evaluate functional programs step by step.
     """
-    def __init__(self, control, stack, environment):
+    def __init__(self, control, stack, environment, memo=None):
         self.control = control
         self.stack = stack
         self.environment = environment
+        self.code = None
+        self.pc = 0
+        self.current_environment = environment[0]
+        self.j = 1
+        self.memo = memo
+        handlers = {
+            Opcode.PUSH: self.execute_push,
+            Opcode.ID: self.execute_id,
+            Opcode.LAMBDA: self.execute_lambda,
+            Opcode.GAMMA: self.execute_gamma,
+            Opcode.RETURN: self.execute_return,
+            Opcode.UNOP: self.execute_unop,
+            Opcode.BINOP: self.execute_binop,
+            Opcode.BETA: self.execute_beta,
+            Opcode.TAU: self.execute_tau,
+            Opcode.JUMP: self.execute_jump,
+            Opcode.REC: self.execute_rec,
+            Opcode.MEMO: self.execute_memo
+        }
+        self.handlers = [handlers[opcode] for opcode in Opcode]
+        self.apply_handlers = {
+            Lambda: self.apply_lambda,
+            Tup: self.apply_tuple,
+            Ystar: self.apply_ystar,
+            Eta: self.apply_eta,
+            Builtin: self.apply_builtin
+        }
+        if memo is not None:
+            self.apply_handlers[Lambda] = self.apply_memoized_lambda
+            self.apply_handlers[Eta] = self.apply_memoized_eta
 
     def execute(self):
-        current_environment = self.environment[0]
-        j = 1
-        while self.control:
-            current_symbol = self.control.pop()
-            if isinstance(current_symbol, Id):
-                self.stack.insert(0, current_environment.lookup(current_symbol))
-            elif isinstance(current_symbol, Lambda):
-                current_symbol.set_environment(current_environment.get_index())
-                self.stack.insert(0, current_symbol)
-            elif isinstance(current_symbol, Gamma):
-                next_symbol = self.stack.pop(0)
-                if isinstance(next_symbol, Lambda):
-                    lambda_expr = next_symbol
-                    e = E(j)
-                    j += 1
-                    if len(lambda_expr.identifiers) == 1:
-                        e.values[lambda_expr.identifiers[0]] = self.stack.pop(0)
-                    else:
-                        tup = self.stack.pop(0)
-                        for i, id in enumerate(lambda_expr.identifiers):
-                            e.values[id] = tup.symbols[i]
-                    for env in self.environment:
-                        if env.get_index() == lambda_expr.get_environment():
-                            e.set_parent(env)
-                    current_environment = e
-                    self.control.append(e)
-                    self.control.append(lambda_expr.get_delta())
-                    self.stack.insert(0, e)
-                    self.environment.append(e)
-                elif isinstance(next_symbol, Tup):
-                    i = int(self.stack.pop(0).get_data())
-                    self.stack.insert(0, next_symbol.symbols[i - 1])
-                elif isinstance(next_symbol, Ystar):
-                    lambda_expr = self.stack.pop(0)
-                    eta = Eta()
-                    eta.set_index(lambda_expr.get_index())
-                    eta.set_environment(lambda_expr.get_environment())
-                    eta.set_identifier(lambda_expr.identifiers[0])
-                    eta.set_lambda(lambda_expr)
-                    self.stack.insert(0, eta)
-                elif isinstance(next_symbol, Eta):
-                    lambda_expr = next_symbol.get_lambda()
-                    self.control.append(Gamma())
-                    self.control.append(Gamma())
-                    self.stack.insert(0, next_symbol)
-                    self.stack.insert(0, lambda_expr)
-                else:
-                    # Built-in function support (partial)
-                    fname = next_symbol.get_data()
-                    if fname == "Stem":
-                        s = self.stack.pop(0)
-                        s.set_data(s.get_data()[0])
-                        self.stack.insert(0, s)
-                    elif fname == "Stern":
-                        s = self.stack.pop(0)
-                        s.set_data(s.get_data()[1:])
-                        self.stack.insert(0, s)
-                    elif fname == "Conc":
-                        s1 = self.stack.pop(0)
-                        s2 = self.stack.pop(0)
-                        s1.set_data(s1.get_data() + s2.get_data())
-                        self.stack.insert(0, s1)
-                    elif fname == "Order":
-                        tup = self.stack.pop(0)
-                        self.stack.insert(0, Int(str(len(tup.symbols))))
-                    elif fname == "Isinteger":
-                        self.stack.insert(0, Bool("true" if isinstance(self.stack[0], Int) else "false"))
-                        self.stack.pop(1)
-                    elif fname == "Isstring":
-                        self.stack.insert(0, Bool("true" if isinstance(self.stack[0], Str) else "false"))
-                        self.stack.pop(1)
-                    elif fname == "Istuple":
-                        self.stack.insert(0, Bool("true" if isinstance(self.stack[0], Tup) else "false"))
-                        self.stack.pop(1)
-                    elif fname == "Isdummy":
-                        self.stack.insert(0, Bool("true" if isinstance(self.stack[0], Dummy) else "false"))
-                        self.stack.pop(1)
-                    elif fname == "Istruthvalue":
-                        self.stack.insert(0, Bool("true" if isinstance(self.stack[0], Bool) else "false"))
-                        self.stack.pop(1)
-                    elif fname == "Isfunction":
-                        self.stack.insert(0, Bool("true" if isinstance(self.stack[0], Lambda) else "false"))
-                        self.stack.pop(1)
-            elif isinstance(current_symbol, E):
-                self.stack.pop(1)
-                self.environment[current_symbol.get_index()].set_is_removed(True)
-                for env in reversed(self.environment):
-                    if not env.get_is_removed():
-                        current_environment = env
-                        break
-            elif isinstance(current_symbol, Rator):
-                if isinstance(current_symbol, Uop):
-                    rand = self.stack.pop(0)
-                    self.stack.insert(0, self.apply_unary_operation(current_symbol, rand))
-                elif isinstance(current_symbol, Bop):
-                    rand1 = self.stack.pop(0)
-                    rand2 = self.stack.pop(0)
-                    self.stack.insert(0, self.apply_binary_operation(current_symbol, rand1, rand2))
-            elif isinstance(current_symbol, Beta):
-                if self.stack[0].get_data() == "true":
-                    self.control.pop()
-                else:
-                    self.control.pop(-2)
-                self.stack.pop(0)
-            elif isinstance(current_symbol, Tau):
-                tup = Tup()
-                for _ in range(current_symbol.get_n()):
-                    tup.symbols.append(self.stack.pop(0))
-                self.stack.insert(0, tup)
-            elif isinstance(current_symbol, Delta):
-                self.control.extend(current_symbol.symbols)
-            elif isinstance(current_symbol, B):
-                self.control.extend(current_symbol.symbols)
-            else:
-                self.stack.insert(0, current_symbol)
-
-    def apply_unary_operation(self, rator, rand):
-        if rator.get_data() == "neg":
-            return Int(str(-int(rand.get_data())))
-        elif rator.get_data() == "not":
-            val = rand.get_data() == "true"
-            return Bool(str(not val).lower())
-        return Err()
-
-    def apply_binary_operation(self, rator, rand1, rand2):
-        op = rator.get_data()
-        val1 = rand1.get_data()
-        val2 = rand2.get_data()
-        if op == "+":
-            return Int(str(int(val1) + int(val2)))
-        elif op == "-":
-            return Int(str(int(val1) - int(val2)))
-        elif op == "*":
-            return Int(str(int(val1) * int(val2)))
-        elif op == "/":
-            return Int(str(int(int(val1) / int(val2))))
-        elif op == "**":
-            return Int(str(int(val1) ** int(val2)))
-        elif op == "&":
-            return Bool(str((val1 == "true") and (val2 == "true")).lower())
-        elif op == "or":
-            return Bool(str((val1 == "true") or (val2 == "true")).lower())
-        elif op == "eq":
-            return Bool(str(val1 == val2).lower())
-        elif op == "ne":
-            return Bool(str(val1 != val2).lower())
-        elif op == "ls":
-            return Bool(str(int(val1) < int(val2)).lower())
-        elif op == "le":
-            return Bool(str(int(val1) <= int(val2)).lower())
-        elif op == "gr":
-            return Bool(str(int(val1) > int(val2)).lower())
-        elif op == "ge":
-            return Bool(str(int(val1) >= int(val2)).lower())
-        elif op == "aug":
-            if isinstance(rand2, Tup):
-                rand1.symbols.extend(rand2.symbols)
-            else:
-                rand1.symbols.append(rand2)
-            return rand1
-        return Err()
+        handlers = self.handlers
+        self.execute_return(None)
+        while self.code is not None:
+            current_symbol = self.code[self.pc]
+            self.pc += 1
+            handlers[current_symbol.opcode](current_symbol)
+
+    def call(self, code, environment):
+        # Suspends the running instruction array on the control stack and starts `code`. A tail call,
+        # whose caller would return right away, does not suspend anything: the callee returns to
+        # the caller's caller, so tail-recursive loops run in constant control and stack space.
+        if self.code[self.pc].opcode != Opcode.RETURN:
+            self.control.append((self.code, self.pc, self.current_environment))
+        self.code = code
+        self.pc = 0
+        self.current_environment = environment
+
+    def execute_push(self, symbol):
+        self.stack.append(symbol)
+
+    def execute_id(self, symbol):
+        self.stack.append(self.current_environment.lookup(symbol))
+
+    def execute_lambda(self, symbol):
+        self.stack.append(symbol.bind(self.current_environment))
+
+    def execute_gamma(self, symbol):
+        rator = self.stack.pop()
+        self.apply_handlers.get(type(rator), self.apply_unknown)(rator)
+
+    def execute_return(self, symbol):
+        if self.control:
+            self.code, self.pc, self.current_environment = self.control.pop()
+        else:
+            self.code = None
+
+    def execute_unop(self, symbol):
+        self.stack.append(symbol.operation(self.stack.pop()))
+
+    def execute_binop(self, symbol):
+        rand1 = self.stack.pop()
+        rand2 = self.stack.pop()
+        self.stack.append(symbol.operation(rand1, rand2))
+
+    def execute_beta(self, symbol):
+        if not self.stack.pop().get_data():
+            self.pc = symbol.target
+
+    def execute_jump(self, symbol):
+        self.pc = symbol.target
+
+    def execute_rec(self, symbol):
+        e = E(self.j)
+        self.j += 1
+        e.set_parent(self.current_environment)
+        closure = symbol.get_lambda().bind(e)
+        closure.memo_prefix = (closure,)
+        e.values = [closure]
+        self.stack.append(closure)
+
+    def execute_memo(self, symbol):
+        self.memo.put(symbol.get_key(), self.stack[-1])
+
+    def execute_tau(self, symbol):
+        pop = self.stack.pop
+        self.stack.append(Tup([pop() for _ in range(symbol.get_n())]))
+
+    def apply_lambda(self, lambda_expr):
+        e = E(self.j)
+        self.j += 1
+        if len(lambda_expr.identifiers) == 1:
+            e.values = [self.stack.pop()]
+        else:
+            e.values = self.stack.pop().get_items(len(lambda_expr.identifiers))
+        e.set_parent(lambda_expr.get_environment())
+        self.call(lambda_expr.get_delta().symbols, e)
+
+    def apply_tuple(self, tup):
+        self.stack.append(tup.get_item(self.stack.pop().get_data()))
+
+    def apply_ystar(self, ystar):
+        lambda_expr = self.stack.pop()
+        eta = Eta()
+        eta.set_index(lambda_expr.get_index())
+        eta.set_environment(lambda_expr.get_environment())
+        eta.set_identifier(lambda_expr.identifiers[0])
+        eta.set_lambda(lambda_expr)
+        self.stack.append(eta)
+
+    def apply_eta(self, eta):
+        # Unfolds one level of recursion: applies the lambda to eta, then the result to the argument
+        self.stack.append(eta)
+        self.stack.append(eta.get_lambda())
+        self.call(ETA_CODE, self.current_environment)
+
+    def apply_memoized_lambda(self, lambda_expr):
+        key = self.get_application_key(lambda_expr.memo_prefix)
+        if key is None:
+            self.apply_lambda(lambda_expr)
+            return
+        code = lambda_expr.get_delta().symbols
+        if code[0].opcode == Opcode.LAMBDA and code[1].opcode == Opcode.RETURN:
+            # A curried function: this application only returns the next closure. It is run right
+            # away and the closure carries the arguments so far, so the application that finally
+            # runs a body is cached under all of them ('rec g n k = ...' is keyed by g, n and k).
+            self.apply_lambda(lambda_expr)
+            closure = code[0].bind(self.current_environment)
+            closure.memo_prefix = key
+            self.stack.append(closure)
+            self.execute_return(None)
+        elif self.apply_memoized(key):
+            self.apply_lambda(lambda_expr)
+
+    def apply_memoized_eta(self, eta):
+        key = self.get_application_key((eta,))
+        if key is None or self.apply_memoized(key):
+            self.apply_eta(eta)
+
+    def get_application_key(self, prefix):
+        # The cache key of applying a function with this key prefix to the argument on top of the stack
+        if prefix is None:
+            return None
+        arg_key = self.get_memo_key(self.stack[-1])
+        return None if arg_key is None else prefix + (arg_key,)
+
+    def apply_memoized(self, key):
+        # Replaces the argument with the cached result and returns False on a hit. On a miss it
+        # makes [Memo, Return] the running code, so the call about to be made returns into it and
+        # the result is cached before control goes back to the caller; it then returns True.
+        value = self.memo.get(key)
+        if value is not None:
+            self.stack[-1] = value
+            return False
+        if self.code[self.pc].opcode != Opcode.RETURN:
+            self.control.append((self.code, self.pc, self.current_environment))
+        self.code = [Memo(key), Return()]
+        self.pc = 0
+        return True
+
+    def get_memo_key(self, value):
+        value_type = type(value)
+        if value_type is Int or value_type is Bool:
+            return value_type, value.get_data()
+        elif value_type is Str:
+            # The view's text itself rather than a copy of its characters: Python caches a string's
+            # hash and compares identical objects without reading them, so views of one text key in O(1)
+            value.flatten()
+            return value_type, value.data, value.start
+        elif value_type is Dummy:
+            return (value_type,)
+        elif value_type is Tup:
+            if value.length > MAX_KEY_ITEMS:
+                return None
+            keys = tuple(self.get_memo_key(item) for item in value.get_items())
+            if None in keys:
+                return None
+            return value_type, keys
+        return None
+
+    def apply_builtin(self, builtin):
+        self.stack.append(builtin.apply(self.stack.pop()))
+
+    def apply_unknown(self, rator):
+        # An identifier that is neither bound nor a builtin: its argument is left as the result
+        pass
+
+    def get_value(self, symbol):
+        # Values carry native payloads; they are only turned into RPAL text here
+        if isinstance(symbol, Tup):
+            return self.get_tuple_value(symbol)
+        elif isinstance(symbol, Bool):
+            return "true" if symbol.get_data() else "false"
+        return str(symbol.get_data())
 
     def get_tuple_value(self, tup):
-        return "(" + ", ".join(
-            self.get_tuple_value(sym) if isinstance(sym, Tup) else sym.get_data()
-            for sym in tup.symbols
-        ) + ")"
+        return "(" + ", ".join(self.get_value(sym) for sym in tup.get_items()) + ")"
 
     def get_answer(self):
         self.execute()
-        if isinstance(self.stack[0], Tup):
-            return self.get_tuple_value(self.stack[0])
-        return self.stack[0].get_data()
+        return self.get_value(self.stack[-1])
 
 # -------------------- CSEMachineFactory --------------------
 class CSEMachineFactory:
-    def __init__(self):
+    def __init__(self, report=print):
+        # report receives messages about tree nodes that have no control symbol
+        self.report = report
         self.e0 = E(0)
+        self.builtins = {name: Builtin(name, arity, handler) for name, (arity, handler) in BUILTINS.items()}
         self.i = 1
         self.j = 0
 
     def get_symbol(self, node):
+        if node.get_type() is not None:
+            return self.get_leaf_symbol(node)
         data = node.get_data()
         if data in ("not", "neg"):
             return Uop(data)
@@ -406,71 +823,111 @@ class CSEMachineFactory:
             return Tau(len(node.get_children()))
         elif data == "<Y*>":
             return Ystar()
-        elif data.startswith("<IDENTIFIER:"):
-            return Id(data[12:-1])
-        elif data.startswith("<INTEGER:"):
-            return Int(data[9:-1])
-        elif data.startswith("<STRING:"):
-            return Str(data[9:-2])
-        elif data.startswith("<NIL"):
+        else:
+            self.report(f"Err node: {data}")
+            return Err()
+
+    def get_leaf_symbol(self, node):
+        node_type = node.get_type()
+        value = node.get_value()
+        if node_type == NodeType.identifier:
+            address = node.get_address()
+            if address is None:
+                # Not bound by any lambda: the builtin of that name, which never changes, so it is
+                # pushed directly instead of being looked up
+                return self.builtins.get(value) or Symbol(sys.intern(value))
+            return Id(sys.intern(value), *address)
+        elif node_type == NodeType.integer:
+            return Int(int(value))
+        elif node_type == NodeType.string:
+            return Str(value[1:-1])
+        elif node_type == NodeType.nil:
             return Tup()
-        elif data.startswith("<TRUE_VALUE:t"):
-            return Bool("true")
-        # elif data.startswith("<TRUE_VALUE:f"):
-        #     return Bool("false")
-        elif data.startswith("<FALSE_VALUE:f"):
-            return Bool("false")
-        elif data.startswith("<dummy>"):
+        elif node_type == NodeType.true_value:
+            return Bool(True)
+        elif node_type == NodeType.false_value:
+            return Bool(False)
+        elif node_type == NodeType.dummy:
             return Dummy()
         else:
-            print("Err node:", data)
+            self.report(f"Err node: {value}")
             return Err()
 
-    def get_b(self, node):
-        b = B()
-        b.symbols = self.get_pre_order_traverse(node)
-        return b
-
     def get_lambda(self, node):
         lambda_expr = Lambda(self.i)
         self.i += 1
         lambda_expr.set_delta(self.get_delta(node.get_children()[1]))
         if node.get_children()[0].get_data() == ",":
             for identifier in node.get_children()[0].get_children():
-                lambda_expr.identifiers.append(Id(identifier.get_data()[12:-1]))
+                lambda_expr.identifiers.append(Id(sys.intern(identifier.get_value())))
         else:
-            lambda_expr.identifiers.append(Id(node.get_children()[0].get_data()[12:-1]))
+            lambda_expr.identifiers.append(Id(sys.intern(node.get_children()[0].get_value())))
         return lambda_expr
 
-    def get_pre_order_traverse(self, node):
-        symbols = []
+    def get_code(self, node, code):
+        # Appends the instructions for node to code in execution order: operands right to left, then the operator
         if node.get_data() == "lambda":
-            symbols.append(self.get_lambda(node))
+            code.append(self.get_lambda(node))
+        elif self.is_recursive_function(node):
+            # gamma(<Y*>, lambda f. lambda ...): the inner lambda's frame parent is the frame binding f
+            code.append(Rec(self.get_lambda(node.get_children()[1].get_children()[1])))
         elif node.get_data() == "->":
-            symbols.append(self.get_delta(node.get_children()[1]))
-            symbols.append(self.get_delta(node.get_children()[2]))
-            symbols.append(Beta())
-            symbols.append(self.get_b(node.get_children()[0]))
+            condition, then_branch, else_branch = node.get_children()
+            self.get_code(condition, code)
+            beta = Beta()
+            code.append(beta)
+            self.get_code(then_branch, code)
+            jump = Jump()
+            code.append(jump)
+            beta.set_target(len(code))
+            self.get_code(else_branch, code)
+            jump.set_target(len(code))
         else:
-            symbols.append(self.get_symbol(node))
-            for child in node.get_children():
-                symbols.extend(self.get_pre_order_traverse(child))
-        return symbols
+            for child in reversed(node.get_children()):
+                self.get_code(child, code)
+            code.append(self.get_symbol(node))
+        return code
+
+    @staticmethod
+    def is_recursive_function(node):
+        if node.get_data() != "gamma" or node.get_children()[0].get_data() != "<Y*>":
+            return False
+        lambda_ = node.get_children()[1]
+        if lambda_.get_data() != "lambda":
+            return False
+        parameter, body = lambda_.get_children()
+        return parameter.get_type() == NodeType.identifier and body.get_data() == "lambda"
 
     def get_delta(self, node):
         delta = Delta(self.j)
         self.j += 1
-        delta.symbols = self.get_pre_order_traverse(node)
+        delta.symbols = self.get_code(node, [])
+        delta.symbols.append(Return())
+        self.thread_jumps(delta.symbols)
         return delta
 
+    @staticmethod
+    def thread_jumps(code):
+        # Points each jump at its final destination and turns jumps to a Return into Returns,
+        # so a call at the end of a conditional branch is seen as a tail call
+        for i, symbol in enumerate(code):
+            if isinstance(symbol, (Beta, Jump)):
+                target = symbol.get_target()
+                while isinstance(code[target], Jump):
+                    target = code[target].get_target()
+                symbol.set_target(target)
+                if isinstance(symbol, Jump) and isinstance(code[target], Return):
+                    code[i] = Return()
+
     def get_control(self, ast):
-        return [self.e0, self.get_delta(ast.get_root())]
+        Resolver().resolve(ast)
+        return [(self.get_delta(ast.get_root()).symbols, 0, self.e0)]
 
     def get_stack(self):
-        return [self.e0]
+        return []
 
     def get_environment(self):
         return [self.e0]
 
-    def get_cse_machine(self, ast):
-        return CSEMachine(self.get_control(ast), self.get_stack(), self.get_environment())
\ No newline at end of file
+    def get_cse_machine(self, ast, memo=None):
+        return CSEMachine(self.get_control(ast), self.get_stack(), self.get_environment(), memo)
\ No newline at end of file
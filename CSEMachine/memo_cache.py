@@ -0,0 +1,50 @@
+from collections import OrderedDict
+
+# Default number of results kept before the least recently used one is evicted
+MEMO_SIZE = 1 << 16
+
+# Longest tuple used as part of a key; building a key reads every component, so an argument that
+# grows on each call (an accumulator) would make a loop quadratic
+MAX_KEY_ITEMS = 64
+
+
+class MemoCache:
+    """
+    Bounded result cache used by the CSE machine in --memoize mode.
+    RPAL has no side effects, so applying the same closure to equal arguments always gives the
+    same result. The machine keys each application of a rec-bound closure by the closure and
+    a structural key of its argument (of every argument, for a curried function), looks the key
+    up before running the body and stores the result when the body returns. Entries are kept in least recently used order, and the
+    oldest one is evicted once the cache holds maxsize of them.
+    Attributes:
+        maxsize (int): Maximum number of cached results
+        entries (OrderedDict): Cached results, least recently used first
+        hits (int): Number of lookups that found a result
+        misses (int): Number of lookups that did not
+        evictions (int): Number of results dropped to stay within maxsize
+    Methods:
+        get(key): Returns the result cached for key, or None
+        put(key, value): Caches value for key, evicting the least recently used result if needed
+    """
+    def __init__(self, maxsize=MEMO_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
@@ -0,0 +1,114 @@
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+# Written at the start of every cache file, before the key it was stored under and the pickle
+MAGIC = b"RPALC\x01"
+
+# Packages whose sources determine the compiled form of a program
+INTERPRETER_PACKAGES = ("LexicalAnalyzer", "Parser", "Standardizer", "Optimizer", "CSEMachine")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Anything a stale, truncated or foreign cache file can raise while being unpickled
+LOAD_ERRORS = (
+    OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, IndexError, KeyError,
+    TypeError, ValueError, RecursionError
+)
+
+
+def get_default_directory():
+    return os.environ.get("RPAL_CACHE_DIR") or os.path.join(os.path.expanduser("~"), ".cache", "rpal")
+
+
+def get_interpreter_version():
+    # A digest of the interpreter's own sources and of the Python that runs it, so editing the
+    # compiler or upgrading Python invalidates every entry, as the magic number does for .pyc files
+    digest = hashlib.sha256(sys.version.encode())
+    for package in INTERPRETER_PACKAGES:
+        directory = os.path.join(ROOT, package)
+        for name in sorted(os.listdir(directory)):
+            if name.endswith(".py"):
+                digest.update(name.encode())
+                with open(os.path.join(directory, name), "rb") as file:
+                    digest.update(file.read())
+    return digest.hexdigest()
+
+
+class ProgramCache:
+    """
+    On-disk cache of compiled programs, in the spirit of __pycache__.
+    Lexing, parsing, standardizing, the optimization passes and building the control structures
+    all depend only on the source text, the passes that were enabled and the interpreter
+    itself. The result of CSEMachineFactory (the control stack and the root environment) is
+    pickled to a file named after a hash of those three, so a warm start unpickles it and goes
+    straight to execution. Each file starts with MAGIC and the full key; a file whose header
+    does not match, or that fails to unpickle, is treated as a miss and removed. Files are
+    written to a temporary name and renamed, so concurrent runs never read a partial entry.
+    Attributes:
+        directory (str): Where cache files are kept
+        version (str): Digest identifying the interpreter that writes and reads the entries
+    Methods:
+        get_key(source, options): Returns the key of a program compiled with the given passes
+        get_path(key): Returns the cache file used for key
+        load(key): Returns the cached (control, environment) for key, or None
+        store(key, control, environment): Writes the compiled program for key; returns whether it was written
+        remove(path): Deletes a cache file, ignoring files that are already gone
+    """
+    def __init__(self, directory=None):
+        self.directory = directory or get_default_directory()
+        self.version = get_interpreter_version()
+
+    def get_key(self, source, options=()):
+        digest = hashlib.sha256(self.version.encode())
+        digest.update(" ".join(sorted(options)).encode())
+        digest.update(b"\0")
+        digest.update(source.encode())
+        return digest.hexdigest()
+
+    def get_path(self, key):
+        return os.path.join(self.directory, key[:2], key + ".rpalc")
+
+    def load(self, key):
+        path = self.get_path(key)
+        try:
+            with open(path, "rb") as file:
+                header = file.read(len(MAGIC) + len(key))
+                if header != MAGIC + key.encode():
+                    raise ValueError("stale cache entry")
+                control, environment = pickle.load(file)
+        except FileNotFoundError:
+            return None
+        except LOAD_ERRORS:
+            self.remove(path)
+            return None
+        return control, environment
+
+    def store(self, key, control, environment):
+        path = self.get_path(key)
+        try:
+            payload = pickle.dumps((control, environment), pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, RecursionError, TypeError, AttributeError):
+            return False
+        temporary = None
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            descriptor, temporary = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(MAGIC + key.encode())
+                file.write(payload)
+            os.replace(temporary, path)
+        except OSError:
+            if temporary is not None:
+                self.remove(temporary)
+            return False
+        return True
+
+    @staticmethod
+    def remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -1,3 +1,4 @@
+import io
 import re
 from enum import Enum, auto
 
@@ -12,10 +13,10 @@ class TokenType(Enum):
     END = auto()
 
 
-KEYWORDS = {
+KEYWORDS = frozenset({
     "let", "in", "fn", "where", "aug", "or", "not", "gr", "ge", "ls", "le",
     "eq", "ne", "true", "false", "nil", "dummy", "within", "and", "rec"
-}
+})
 
 PUNCTUATION = {'(', ')', ';', ','}
 
@@ -24,21 +25,45 @@ OPERATOR_SYMBOLS = r'\+\-\*<>&\.@/:=~\|$!#%\^_\[\]\{\}"\'\?'
 TOKEN_REGEX = [
     ("COMMENT", r"//[^\n]*"),
     ("SPACE", r"[ \t\n]+"),
-    ("STRING", r"\'(\\[nt\\'\"]|[^\\'])*\'"),
+    ("STRING", r"\'(?:\\[nt\\'\"]|[^\\'])*\'"),
     ("INTEGER", r"\d+"),
-    ("KEYWORD", r"\b(" + '|'.join(KEYWORDS) + r")\b"),
     ("IDENTIFIER", r"[A-Za-z][A-Za-z0-9_]*"),
     ("OPERATOR", f"[{OPERATOR_SYMBOLS}]+"),
-    ("PUNCTUATION", r"[();,]")
+    ("PUNCTUATION", r"[();,]"),
+    ("MISMATCH", r"[\s\S]")
 ]
 
-COMPILED_PATTERNS = [(name, re.compile(pattern)) for name, pattern in TOKEN_REGEX] #Precompiles regex patterns for performance
+# A single alternation of named groups, tried in the order above, so every token is found
+# with one match attempt. Keywords are lexed as identifiers and reclassified by KEYWORDS lookup.
+MASTER_PATTERN = re.compile("|".join(f"(?P<{name}>{pattern})" for name, pattern in TOKEN_REGEX))
+
+SKIPPED = {"COMMENT", "SPACE"}
+
+# Characters read per chunk when tokenizing a stream
+CHUNK_SIZE = 1 << 16
+
+TOKEN_TYPES = {
+    "STRING": TokenType.STRING,
+    "INTEGER": TokenType.INTEGER,
+    "IDENTIFIER": TokenType.IDENTIFIER,
+    "OPERATOR": TokenType.OPERATOR,
+    "PUNCTUATION": TokenType.PUNCTUATION
+}
 
 
 class Token:
-    def __init__(self, type_: TokenType, value: str):
+    """
+    A lexical token. Tokens use __slots__ so a large token list carries no per-instance
+    __dict__, and each one records the span [start, end) of its text in the input so later
+    phases can report positions without lexing the source again.
+    """
+    __slots__ = ("type", "value", "start", "end")
+
+    def __init__(self, type_: TokenType, value: str, start: int = -1, end: int = -1):
         self.type = type_
         self.value = value
+        self.start = start
+        self.end = end
 
     def __str__(self):
         return f"<{self.type.name}:{self.value}>"
@@ -47,12 +72,75 @@ class Token:
         return self.__str__()
 
 
+def iter_tokens(source, chunk_size=CHUNK_SIZE):
+    """
+    Lazily tokenizes a string or a readable text stream (an open file, sys.stdin).
+    Streams are read chunk_size characters at a time and tokens are yielded as soon as
+    they are known to be complete, so the caller can start consuming tokens (and report
+    syntax errors) before the whole input has been read. Only the unconsumed tail of the
+    current chunk is kept in memory.
+    Args:
+        source (str | TextIO): The source code text, or a stream to read it from.
+        chunk_size (int): Number of characters requested from the stream per read.
+    Yields:
+        Token: The lexical elements of the input, followed by a single EOF token.
+    Raises:
+        SyntaxError: If an unexpected character is encountered that doesn't match
+                    any of the defined token patterns.
+    Note:
+        - A match that reaches the end of the buffered text is held back until more
+          input is read, since the token (an identifier, a string) may continue there
+        - Positions in error messages are offsets from the start of the input
+    """
+    if isinstance(source, str):
+        source = io.StringIO(source)
+        chunk_size = -1
+
+    match_token = MASTER_PATTERN.match
+    keywords = KEYWORDS
+    skipped = SKIPPED
+    token_types = TOKEN_TYPES
+    buffer = ""
+    offset = 0
+    eof = False
+
+    while not eof or buffer:
+        if not eof:
+            chunk = source.read(chunk_size)
+            eof = not chunk
+            buffer += chunk
+        length = len(buffer)
+        position = 0
+
+        while position < length:
+            match = match_token(buffer, position)
+            kind = match.lastgroup
+            if not eof and (match.end() == length or (kind == "OPERATOR" and "'" in match.group())):
+                break  # The token may be cut off at the chunk boundary
+            position = match.end()
+            if kind in skipped:
+                continue
+            text = match.group()
+            start = offset + match.start()
+            if kind == "IDENTIFIER" and text in keywords:
+                yield Token(TokenType.KEYWORD, text, start, offset + position)
+            elif kind == "MISMATCH":
+                raise SyntaxError(f"Unexpected character at position {start}: '{text}'")
+            else:
+                yield Token(token_types[kind], text, start, offset + position)
+
+        buffer = buffer[position:]
+        offset += position
+
+    yield Token(TokenType.END, "EOF", offset, offset)
+
+
 def tokenize(input_text):
     """
     Tokenizes input text into a list of tokens for lexical analysis.
-    This function processes the input text character by character, matching against
-    predefined compiled patterns to identify different types of tokens such as
-    keywords, identifiers, integers, strings, operators, and punctuation.
+    This function scans the input text with one combined pattern, so each token is
+    recognised by a single match attempt. Identifiers are reclassified as keywords
+    through a set lookup.
     Args:
         input_text (str): The source code text to be tokenized.
     Returns:
@@ -63,41 +151,10 @@ def tokenize(input_text):
                     any of the defined token patterns.
     Note:
         - Whitespace and comments are skipped during tokenization
-        - The function relies on COMPILED_PATTERNS being defined in the module scope
+        - Use iter_tokens() to feed the parser without building the whole list
         - Each token contains a type (from TokenType enum) and the matched text
     """
-    tokens = []
-    position = 0
-    length = len(input_text)
-
-    while position < length:
-        matched = False
-        for name, pattern in COMPILED_PATTERNS:
-            match = pattern.match(input_text, position)
-            if match:
-                text = match.group(0)
-                if name == "SPACE" or name == "COMMENT":
-                    pass  # Skip whitespace/comments
-                elif name == "KEYWORD":
-                    tokens.append(Token(TokenType.KEYWORD, text))
-                elif name == "IDENTIFIER":
-                    tokens.append(Token(TokenType.IDENTIFIER, text))
-                elif name == "INTEGER":
-                    tokens.append(Token(TokenType.INTEGER, text))
-                elif name == "STRING":
-                    tokens.append(Token(TokenType.STRING, text))
-                elif name == "OPERATOR":
-                    tokens.append(Token(TokenType.OPERATOR, text))
-                elif name == "PUNCTUATION":
-                    tokens.append(Token(TokenType.PUNCTUATION, text))
-                matched = True
-                position = match.end()
-                break
-        if not matched:
-            raise SyntaxError(f"Unexpected character at position {position}: '{input_text[position]}'")
-
-    tokens.append(Token(TokenType.END, "EOF"))
-    return tokens
+    return list(iter_tokens(input_text))
 
 
 
@@ -0,0 +1,166 @@
+from Parser.node import NodeType
+from Standardizer.standardizer import NodeFactory
+from CSEMachine.CSEM import divide
+from Optimizer.tree_utils import get_size
+
+LITERAL_TYPES = {NodeType.integer, NodeType.string, NodeType.true_value, NodeType.false_value}
+
+# Folded integers are stored as decimal literals; results wider than this are left to the machine,
+# well below the digits Python agrees to convert (sys.get_int_max_str_digits)
+MAX_LITERAL_BITS = 8192
+
+
+# operator -> (operand type, function over the Python values)
+UNARY_FOLDS = {
+    "neg": (int, lambda val: -val),
+    "not": (bool, lambda val: not val)
+}
+
+BINARY_FOLDS = {
+    "+": (int, lambda val1, val2: val1 + val2),
+    "-": (int, lambda val1, val2: val1 - val2),
+    "*": (int, lambda val1, val2: val1 * val2),
+    "/": (int, divide),
+    "**": (int, lambda val1, val2: val1 ** val2),
+    "&": (bool, lambda val1, val2: val1 and val2),
+    "or": (bool, lambda val1, val2: val1 or val2),
+    "ls": (int, lambda val1, val2: val1 < val2),
+    "le": (int, lambda val1, val2: val1 <= val2),
+    "gr": (int, lambda val1, val2: val1 > val2),
+    "ge": (int, lambda val1, val2: val1 >= val2),
+    "eq": (None, lambda val1, val2: val1 == val2),
+    "ne": (None, lambda val1, val2: val1 != val2)
+}
+
+
+class ConstantFolder:
+    """
+    Constant folding and partial evaluation pass over a standardized AST.
+    Works bottom-up, so folded operands can make their parents foldable in turn:
+        - arithmetic, boolean and comparison operators whose operands are literals are replaced
+          by the literal result
+        - '->' nodes with a literal condition are replaced by the branch that would be taken;
+          the condition is folded first, so the branch that is dropped is never folded
+        - 'gamma' of a tuple of literals applied to a literal index is replaced by that component
+    Division by zero, negative exponents and integers wider than MAX_LITERAL_BITS are left for
+    the CSE machine to evaluate.
+    Attributes:
+        eliminated (int): Number of tree nodes removed so far
+    Methods:
+        optimize(ast): Folds the AST in place and returns it
+        fold(node): Folds the subtree rooted at node and returns its replacement
+        get_literal(node): Returns the Python value of a literal leaf, or None
+        get_literal_node(value, depth): Builds the literal leaf for a Python value
+        is_too_large(data, val1, val2): Tells whether an integer result would not fit a literal
+        get_report(): Returns a one-line summary of what the pass did
+    """
+    def __init__(self):
+        self.eliminated = 0
+
+    def optimize(self, ast):
+        if ast.get_root():
+            root = self.fold(ast.get_root())
+            root.set_parent(None)
+            ast.set_root(root)
+        return ast
+
+    def get_report(self):
+        return f"Constant folding eliminated {self.eliminated} nodes"
+
+    def fold(self, node):
+        if node.get_data() == "->":
+            condition = self.fold(node.get_children()[0])
+            value = self.get_literal(condition)
+            if type(value) is bool:
+                branch = node.get_children()[1 if value else 2]
+                self.eliminated += get_size(node) - get_size(branch)
+                replacement = self.fold(branch)
+                replacement.set_depth(node.get_depth())
+                return replacement
+            condition.set_parent(node)
+            node.children[0] = condition
+            children = enumerate(node.get_children()[1:], 1)
+        else:
+            children = enumerate(node.get_children())
+
+        for i, child in children:
+            folded = self.fold(child)
+            if folded is not child:
+                folded.set_parent(node)
+                node.children[i] = folded
+
+        replacement = self.fold_node(node)
+        if replacement is None:
+            return node
+        self.eliminated += get_size(node) - get_size(replacement)
+        replacement.set_depth(node.get_depth())
+        return replacement
+
+    def fold_node(self, node):
+        data = node.get_data()
+        children = node.get_children()
+
+        if data in UNARY_FOLDS and len(children) == 1:
+            operand_type, function = UNARY_FOLDS[data]
+            value = self.get_literal(children[0])
+            if type(value) is operand_type:
+                return self.get_literal_node(function(value), node.get_depth())
+
+        elif data in BINARY_FOLDS and len(children) == 2:
+            operand_type, function = BINARY_FOLDS[data]
+            val1 = self.get_literal(children[0])
+            val2 = self.get_literal(children[1])
+            if val1 is None or val2 is None or type(val1) is not type(val2):
+                return None
+            if operand_type is not None and type(val1) is not operand_type:
+                return None
+            if (data == "/" and val2 == 0) or (data == "**" and val2 < 0):
+                return None
+            if operand_type is int and self.is_too_large(data, val1, val2):
+                return None
+            return self.get_literal_node(function(val1, val2), node.get_depth())
+
+        elif data == "gamma" and children[0].get_data() == "tau":
+            components = children[0].get_children()
+            index = self.get_literal(children[1])
+            if type(index) is int and 1 <= index <= len(components) and \
+                    all(self.get_literal(component) is not None for component in components):
+                return components[index - 1]
+
+        return None
+
+    @staticmethod
+    def get_literal(node):
+        node_type = node.get_type()
+        if node_type not in LITERAL_TYPES:
+            return None
+        if node_type == NodeType.integer:
+            return int(node.get_value())
+        elif node_type == NodeType.true_value:
+            return True
+        elif node_type == NodeType.false_value:
+            return False
+        return node.get_value()
+
+    @staticmethod
+    def get_literal_node(value, depth):
+        if value is True:
+            return NodeFactory.get_leaf_node(NodeType.true_value, "true", depth)
+        elif value is False:
+            return NodeFactory.get_leaf_node(NodeType.false_value, "false", depth)
+        elif isinstance(value, int):
+            return NodeFactory.get_leaf_node(NodeType.integer, str(value), depth)
+        return NodeFactory.get_leaf_node(NodeType.string, value, depth)
+
+    @staticmethod
+    def is_too_large(data, val1, val2):
+        # Estimated from the operands' widths, so a huge power is never computed
+        bits1 = abs(val1).bit_length()
+        bits2 = abs(val2).bit_length()
+        if data == "**":
+            bits = val2 * bits1 if bits1 > 1 else 1
+        elif data == "*":
+            bits = bits1 + bits2
+        else:
+            bits = max(bits1, bits2) + 1
+        return bits > MAX_LITERAL_BITS
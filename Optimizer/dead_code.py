@@ -0,0 +1,84 @@
+from Parser.node import NodeType
+from Optimizer.tree_utils import MAX_PASSES, VALUE_TYPES, count_free, get_parameter_leaves, update_links
+
+
+class DeadCodeEliminator:
+    """
+    Dead binding elimination pass over a standardized AST.
+    'let x = E in B' standardizes to gamma(lambda x. B, E) and 'let x1 = E1 and ... and xn = En in B'
+    to gamma(lambda (x1, ..., xn). B, tau(E1, ..., En)). A binding is dead when its name does not
+    occur free in B. Dead bindings are removed when their right-hand side is pure, i.e. evaluating
+    it cannot fail or print: literals, identifiers, lambdas, rec definitions and tuples of those.
+    Simultaneous definitions are shrunk to the components still referenced, and the application
+    disappears once no binding is left.
+    Attributes:
+        removed (list): Names of the bindings removed so far, in the order they were removed
+    Methods:
+        optimize(ast): Removes dead bindings from the AST until nothing changes and returns it
+        eliminate(node): Removes the dead bindings under node and returns its replacement
+        is_pure(node): Returns whether evaluating node can neither fail nor have side effects
+        get_report(): Returns a one-line summary of what the pass did
+    """
+    def __init__(self):
+        self.removed = []
+
+    def optimize(self, ast):
+        if ast.get_root():
+            for _ in range(MAX_PASSES):
+                count = len(self.removed)
+                ast.set_root(self.eliminate(ast.get_root()))
+                if len(self.removed) == count:
+                    break
+            update_links(ast.get_root())
+        return ast
+
+    def get_report(self):
+        removed = ", ".join(self.removed) or "nothing"
+        return f"Dead code elimination removed {len(self.removed)} bindings: {removed}"
+
+    def eliminate(self, node):
+        node.children = [self.eliminate(child) for child in node.get_children()]
+        if node.get_data() != "gamma" or node.get_children()[0].get_data() != "lambda":
+            return node
+
+        lambda_, rand = node.get_children()
+        parameter, body = lambda_.get_children()
+
+        if parameter.get_type() == NodeType.identifier:
+            if not count_free(body, parameter.get_value()) and self.is_pure(rand):
+                self.removed.append(parameter.get_value())
+                return body
+            return node
+
+        # Simultaneous definitions: only a literal tuple of right-hand sides can be shrunk
+        leaves = get_parameter_leaves(parameter)
+        if parameter.get_data() != "," or rand.get_data() != "tau" or len(rand.get_children()) != len(leaves):
+            return node
+
+        live = []
+        for leaf, component in zip(leaves, rand.get_children()):
+            if count_free(body, leaf.get_value()) or not self.is_pure(component):
+                live.append((leaf, component))
+            else:
+                self.removed.append(leaf.get_value())
+
+        if len(live) == len(leaves):
+            return node
+        if not live:
+            return body
+        if len(live) == 1:
+            lambda_.children[0], node.children[1] = live[0]
+        else:
+            parameter.children = [leaf for leaf, _ in live]
+            rand.children = [component for _, component in live]
+        return node
+
+    def is_pure(self, node):
+        if node.get_type() in VALUE_TYPES or node.get_data() == "lambda":
+            return True
+        if node.get_data() == "tau":
+            return all(self.is_pure(child) for child in node.get_children())
+        if node.get_data() == "gamma":
+            rator, rand = node.get_children()
+            return rator.get_data() == "<Y*>" and rand.get_data() == "lambda"
+        return False
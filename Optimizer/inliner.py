@@ -0,0 +1,107 @@
+from Parser.node import NodeType
+from Optimizer.tree_utils import (
+    MAX_PASSES, VALUE_TYPES, copy_tree, count_free, get_free_names, get_parameter_leaves, get_parameter_names,
+    get_size, update_links
+)
+
+# Lambdas up to this many nodes are copied into every use; larger ones only into a single use
+INLINE_SIZE = 16
+
+
+class Inliner:
+    """
+    Beta-reduction pass over a standardized AST.
+    'let x = E in B' standardizes to gamma(lambda x. B, E). When E is a value (a literal, an
+    identifier or a lambda) and is small or used once, the application is replaced by B with E
+    substituted for x, which saves a frame, a Gamma step and a Delta at run time. rec bindings
+    standardize to gamma(<Y*>, ...) and are never inlined.
+    Only values are substituted, so no computation is duplicated, delayed or dropped. Lambdas
+    inside B that bind a free variable of E are renamed first, so substitution never captures
+    it; fresh names contain '$', which cannot occur in an RPAL identifier.
+    Attributes:
+        inlined (int): Number of bindings inlined so far
+        fresh_names (int): Counter used to build fresh identifier names
+    Methods:
+        optimize(ast): Inlines bindings in the AST until nothing changes and returns it
+        inline(node): Inlines the redexes under node and returns its replacement
+        substitute(node, name, value, free): Replaces the free occurrences of name under node with copies of value
+        rename(node, old, new): Renames the free occurrences of old under node
+        get_report(): Returns a one-line summary of what the pass did
+    """
+    def __init__(self):
+        self.inlined = 0
+        self.fresh_names = 0
+
+    def optimize(self, ast):
+        if ast.get_root():
+            for _ in range(MAX_PASSES):
+                count = self.inlined
+                ast.set_root(self.inline(ast.get_root()))
+                if self.inlined == count:
+                    break
+            update_links(ast.get_root())
+        return ast
+
+    def get_report(self):
+        return f"Inlining removed {self.inlined} bindings"
+
+    def inline(self, node):
+        node.children = [self.inline(child) for child in node.get_children()]
+        if node.get_data() != "gamma":
+            return node
+
+        rator, rand = node.get_children()
+        if rator.get_data() != "lambda" or not self.is_value(rand):
+            return node
+        parameter, body = rator.get_children()
+        if parameter.get_type() != NodeType.identifier:
+            return node
+
+        name = parameter.get_value()
+        uses = count_free(body, name)
+        if uses > 1 and get_size(rand) > INLINE_SIZE:
+            return node
+
+        self.inlined += 1
+        return self.substitute(body, name, rand, get_free_names(rand))
+
+    @staticmethod
+    def is_value(node):
+        return node.get_type() in VALUE_TYPES or node.get_data() == "lambda"
+
+    def substitute(self, node, name, value, free):
+        if node.get_type() == NodeType.identifier:
+            return copy_tree(value) if node.get_value() == name else node
+
+        if node.get_data() == "lambda":
+            parameter, body = node.get_children()
+            names = get_parameter_names(parameter)
+            if name in names:
+                return node
+            clashes = [old for old in names if old in free]
+            if clashes and count_free(body, name):
+                for old in clashes:
+                    new = self.get_fresh_name(old)
+                    for leaf in get_parameter_leaves(parameter):
+                        if leaf.get_value() == old:
+                            leaf.set_value(new)
+                    body = self.rename(body, old, new)
+            node.children[1] = self.substitute(body, name, value, free)
+            return node
+
+        node.children = [self.substitute(child, name, value, free) for child in node.get_children()]
+        return node
+
+    def rename(self, node, old, new):
+        if node.get_type() == NodeType.identifier:
+            if node.get_value() == old:
+                node.set_value(new)
+            return node
+        if node.get_data() == "lambda" and old in get_parameter_names(node.get_children()[0]):
+            return node
+        node.children = [self.rename(child, old, new) for child in node.get_children()]
+        return node
+
+    def get_fresh_name(self, name):
+        self.fresh_names += 1
+        return f"{name.split('$')[0]}${self.fresh_names}"
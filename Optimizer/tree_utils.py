@@ -0,0 +1,75 @@
+# Helpers shared by the optimization passes over standardized ASTs
+from Parser.node import NodeType
+from Standardizer.standardizer import NodeFactory
+
+# Upper bound on the number of passes an optimizer makes while each pass keeps exposing more work
+MAX_PASSES = 8
+
+# Leaves that are already values: evaluating them can neither fail nor have side effects
+VALUE_TYPES = {
+    NodeType.identifier, NodeType.integer, NodeType.string, NodeType.true_value,
+    NodeType.false_value, NodeType.nil, NodeType.dummy
+}
+
+
+def get_parameter_leaves(parameter):
+    if parameter.get_data() == ",":
+        return parameter.get_children()
+    return [parameter]
+
+
+def get_parameter_names(parameter):
+    return {leaf.get_value() for leaf in get_parameter_leaves(parameter)}
+
+
+def count_free(node, name):
+    """Counts the occurrences of name under node that are not bound by a lambda inside node."""
+    if node.get_type() == NodeType.identifier:
+        return 1 if node.get_value() == name else 0
+    if node.get_data() == "lambda" and name in get_parameter_names(node.get_children()[0]):
+        return 0
+    return sum(count_free(child, name) for child in node.get_children())
+
+
+def get_free_names(node, bound=frozenset()):
+    if node.get_type() == NodeType.identifier:
+        return set() if node.get_value() in bound else {node.get_value()}
+    if node.get_data() == "lambda":
+        parameter, body = node.get_children()
+        return get_free_names(body, bound | get_parameter_names(parameter))
+    free = set()
+    for child in node.get_children():
+        free |= get_free_names(child, bound)
+    return free
+
+
+def copy_tree(node):
+    if node.get_type() is not None:
+        copy = NodeFactory.get_leaf_node(node.get_type(), node.get_value(), node.get_depth())
+    else:
+        copy = NodeFactory.get_node(node.get_data(), node.get_depth())
+        copy.children = [copy_tree(child) for child in node.get_children()]
+    copy.is_standardized = True
+    return copy
+
+
+def get_size(node):
+    size = 0
+    pending = [node]
+    while pending:
+        current = pending.pop()
+        size += 1
+        pending.extend(current.get_children())
+    return size
+
+
+def update_links(root):
+    """Resets the parent and depth of every node below root after the tree has been rewritten."""
+    root.set_parent(None)
+    pending = [root]
+    while pending:
+        node = pending.pop()
+        for child in node.get_children():
+            child.set_parent(node)
+            child.set_depth(node.get_depth() + 1)
+            pending.append(child)
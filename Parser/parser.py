@@ -1,5 +1,6 @@
-from LexicalAnalyzer.lexical_analyzer import TokenType, Token
+from LexicalAnalyzer.lexical_analyzer import TokenType
 from Parser.node import Node, NodeType
+from Parser.token_stream import TokenStream
 
 
 class Parser:
@@ -20,7 +21,8 @@ class Parser:
     represented as a list of Node objects. It follows a predictive parsing approach
     where each grammar rule is implemented as a separate method.
     Attributes:
-        tokens (list): List of Token objects to be parsed
+        tokens (TokenStream): Cursor over the Token objects to be parsed
+        report (callable): Receives each syntax error message; print by default
         ast (list): Stack-based representation of the AST being constructed
         string_ast (list): String representation of the AST for display purposes
     Methods:
@@ -34,20 +36,20 @@ class Parser:
     The parser uses a bottom-up approach to build the AST, where nodes are pushed onto
     a stack and later combined based on their arity (number of children).
     """
-    def __init__(self, tokens):
-        self.tokens = tokens
+    def __init__(self, tokens, report=print):
+        self.tokens = TokenStream(tokens)
+        self.report = report
         self.ast = []
         self.string_ast = []
 
     def parse(self):
-        self.tokens.append(Token(TokenType.END, "EOF"))
         self.E()
-        if self.tokens[0].type == TokenType.END:
+        if self.tokens.peek().type == TokenType.END:
             return self.ast
         else:
-            print("Parsing Unsuccessful! Remaining tokens:")
-            for token in self.tokens:
-                print(f"<{token.type}, {token.value}>")
+            self.report(f"Parsing Unsuccessful at position {self.tokens.peek().start}! Remaining tokens:")
+            for token in self.tokens.remaining():
+                self.report(f"<{token.type}, {token.value}>")
             return None
 
     def convert_ast_to_string_ast(self):
@@ -91,24 +93,24 @@ class Parser:
             self.string_ast.append(f"{dots}{node.value}")
 
     def E(self):
-        token = self.tokens[0]
+        token = self.tokens.peek()
         if token.type == TokenType.KEYWORD and token.value == "let":
-            self.tokens.pop(0)
+            self.tokens.advance()
             self.D()
-            if self.tokens[0].value != "in":
-                print("Error: 'in' expected after 'let'")
-            self.tokens.pop(0)
+            if self.tokens.peek().value != "in":
+                self.report("Error: 'in' expected after 'let'")
+            self.tokens.advance()
             self.E()
             self.ast.append(Node(NodeType.let, "let", 2))
         elif token.type == TokenType.KEYWORD and token.value == "fn":
-            self.tokens.pop(0)
+            self.tokens.advance()
             count = 0
-            while self.tokens[0].type == TokenType.IDENTIFIER or self.tokens[0].value == "(":
+            while self.tokens.peek().type == TokenType.IDENTIFIER or self.tokens.peek().value == "(":
                 self.Vb()
                 count += 1
-            if self.tokens[0].value != ".":
-                print("Error: '.' expected after fn parameters")
-            self.tokens.pop(0)
+            if self.tokens.peek().value != ".":
+                self.report("Error: '.' expected after fn parameters")
+            self.tokens.advance()
             self.E()
             self.ast.append(Node(NodeType.lambda_expr, "lambda", count + 1))
         else:
@@ -116,16 +118,16 @@ class Parser:
 
     def Ew(self):
         self.T()
-        if self.tokens[0].value == "where":
-            self.tokens.pop(0)
+        if self.tokens.peek().value == "where":
+            self.tokens.advance()
             self.Dr()
             self.ast.append(Node(NodeType.where, "where", 2))
 
     def T(self):
         self.Ta()
         count = 1
-        while self.tokens[0].value == ",":
-            self.tokens.pop(0)
+        while self.tokens.peek().value == ",":
+            self.tokens.advance()
             self.Ta()
             count += 1
         if count > 1:
@@ -133,39 +135,39 @@ class Parser:
 
     def Ta(self):
         self.Tc()
-        while self.tokens[0].value == "aug":
-            self.tokens.pop(0)
+        while self.tokens.peek().value == "aug":
+            self.tokens.advance()
             self.Tc()
             self.ast.append(Node(NodeType.aug, "aug", 2))
 
     def Tc(self):
         self.B()
-        if self.tokens[0].value == "->":
-            self.tokens.pop(0)
+        if self.tokens.peek().value == "->":
+            self.tokens.advance()
             self.Tc()
-            if self.tokens[0].value != "|":
-                print("Error: '|' expected in conditional")
-            self.tokens.pop(0)
+            if self.tokens.peek().value != "|":
+                self.report("Error: '|' expected in conditional")
+            self.tokens.advance()
             self.Tc()
             self.ast.append(Node(NodeType.conditional, "->", 3))
 
     def B(self):
         self.Bt()
-        while self.tokens[0].value == "or":
-            self.tokens.pop(0)
+        while self.tokens.peek().value == "or":
+            self.tokens.advance()
             self.Bt()
             self.ast.append(Node(NodeType.op_or, "or", 2))
 
     def Bt(self):
         self.Bs()
-        while self.tokens[0].value == "&":
-            self.tokens.pop(0)
+        while self.tokens.peek().value == "&":
+            self.tokens.advance()
             self.Bs()
             self.ast.append(Node(NodeType.op_and, "&", 2))
 
     def Bs(self):
-        if self.tokens[0].value == "not":
-            self.tokens.pop(0)
+        if self.tokens.peek().value == "not":
+            self.tokens.advance()
             self.Bp()
             self.ast.append(Node(NodeType.op_not, "not", 1))
         else:
@@ -173,8 +175,8 @@ class Parser:
 
     def Bp(self):
         self.A()
-        if self.tokens[0].value in ["gr", "ge", "ls", "le", "eq", "ne", ">", ">=", "<", "<="]:
-            op = self.tokens.pop(0).value
+        if self.tokens.peek().value in ["gr", "ge", "ls", "le", "eq", "ne", ">", ">=", "<", "<="]:
+            op = self.tokens.advance().value
             self.A()
             mapped_op = {
                 ">": "gr", ">=": "ge", "<": "ls", "<=": "le"
@@ -182,55 +184,55 @@ class Parser:
             self.ast.append(Node(NodeType.op_compare, mapped_op, 2))
 
     def A(self):
-        if self.tokens[0].value in {"+", "-"}:
-            unary = self.tokens.pop(0).value
+        if self.tokens.peek().value in {"+", "-"}:
+            unary = self.tokens.advance().value
             self.At()
             if unary == "-":
                 self.ast.append(Node(NodeType.op_neg, "neg", 1))
         else:
             self.At()
-        while self.tokens[0].value in {"+", "-"}:
-            op = self.tokens.pop(0).value
+        while self.tokens.peek().value in {"+", "-"}:
+            op = self.tokens.advance().value
             self.At()
             node_type = NodeType.op_plus if op == "+" else NodeType.op_minus
             self.ast.append(Node(node_type, op, 2))
 
     def At(self):
         self.Af()
-        while self.tokens[0].value in {"*", "/"}:
-            op = self.tokens.pop(0).value
+        while self.tokens.peek().value in {"*", "/"}:
+            op = self.tokens.advance().value
             self.Af()
             node_type = NodeType.op_mul if op == "*" else NodeType.op_div
             self.ast.append(Node(node_type, op, 2))
 
     def Af(self):
         self.Ap()
-        if self.tokens[0].value == "**":
-            self.tokens.pop(0)
+        if self.tokens.peek().value == "**":
+            self.tokens.advance()
             self.Af()
             self.ast.append(Node(NodeType.op_pow, "**", 2))
 
     def Ap(self):
         self.R()
-        while self.tokens[0].value == "@":
-            self.tokens.pop(0)
-            if self.tokens[0].type != TokenType.IDENTIFIER:
-                print("Error: identifier expected after '@'")
+        while self.tokens.peek().value == "@":
+            self.tokens.advance()
+            if self.tokens.peek().type != TokenType.IDENTIFIER:
+                self.report("Error: identifier expected after '@'")
                 return
-            self.ast.append(Node(NodeType.identifier, self.tokens[0].value, 0))
-            self.tokens.pop(0)
+            self.ast.append(Node(NodeType.identifier, self.tokens.peek().value, 0))
+            self.tokens.advance()
             self.R()
             self.ast.append(Node(NodeType.at, "@", 3))
 
     def R(self):
         self.Rn()
-        while self.tokens[0].type in [TokenType.IDENTIFIER, TokenType.INTEGER, TokenType.STRING] or \
-              self.tokens[0].value in ["true", "false", "nil", "dummy", "("]:
+        while self.tokens.peek().type in [TokenType.IDENTIFIER, TokenType.INTEGER, TokenType.STRING] or \
+              self.tokens.peek().value in ["true", "false", "nil", "dummy", "("]:
             self.Rn()
             self.ast.append(Node(NodeType.gamma, "gamma", 2))
 
     def Rn(self):
-        token = self.tokens[0]
+        token = self.tokens.peek()
         if token.type == TokenType.IDENTIFIER:
             self.ast.append(Node(NodeType.identifier, token.value, 0))
         elif token.type == TokenType.INTEGER:
@@ -247,32 +249,32 @@ class Parser:
             if token.value in keyword_map:
                 self.ast.append(Node(keyword_map[token.value], token.value, 0))
             else:
-                print(f"Unexpected keyword in Rn: {token.value}")
+                self.report(f"Unexpected keyword in Rn: {token.value}")
         elif token.value == "(":
-            self.tokens.pop(0)
+            self.tokens.advance()
             self.E()
-            if self.tokens[0].value != ")":
-                print("Error: ')' expected")
+            if self.tokens.peek().value != ")":
+                self.report("Error: ')' expected")
             else:
-                self.tokens.pop(0)
+                self.tokens.advance()
             return
         else:
-            print(f"Unexpected token in Rn: {token}")
-        self.tokens.pop(0)
+            self.report(f"Unexpected token in Rn: {token}")
+        self.tokens.advance()
 
 
     def D(self):
         self.Da()
-        if self.tokens[0].value == "within":
-            self.tokens.pop(0)
+        if self.tokens.peek().value == "within":
+            self.tokens.advance()
             self.D()
             self.ast.append(Node(NodeType.within, "within", 2))
 
     def Da(self):
         self.Dr()
         n = 1
-        while self.tokens[0].value == "and":
-            self.tokens.pop(0)
+        while self.tokens.peek().value == "and":
+            self.tokens.advance()
             self.Dr()
             n += 1
         if n > 1:
@@ -280,74 +282,74 @@ class Parser:
 
     def Dr(self):
         is_rec = False
-        if self.tokens[0].value == "rec":
-            self.tokens.pop(0)
+        if self.tokens.peek().value == "rec":
+            self.tokens.advance()
             is_rec = True
         self.Db()
         if is_rec:
             self.ast.append(Node(NodeType.rec, "rec", 1))
 
     def Db(self):
-        if self.tokens[0].type == TokenType.PUNCTUATION and self.tokens[0].value == "(":
-            self.tokens.pop(0)
+        if self.tokens.peek().type == TokenType.PUNCTUATION and self.tokens.peek().value == "(":
+            self.tokens.advance()
             self.D()
-            if self.tokens[0].value != ")":
-                print("Parsing error at Db #1")
-            self.tokens.pop(0)
-        elif self.tokens[0].type == TokenType.IDENTIFIER:
-            if self.tokens[1].value == "(" or self.tokens[1].type == TokenType.IDENTIFIER:
-                self.ast.append(Node(NodeType.identifier, self.tokens[0].value, 0))
-                self.tokens.pop(0)
+            if self.tokens.peek().value != ")":
+                self.report("Parsing error at Db #1")
+            self.tokens.advance()
+        elif self.tokens.peek().type == TokenType.IDENTIFIER:
+            if self.tokens.peek(1).value == "(" or self.tokens.peek(1).type == TokenType.IDENTIFIER:
+                self.ast.append(Node(NodeType.identifier, self.tokens.peek().value, 0))
+                self.tokens.advance()
                 n = 1
-                while self.tokens[0].type == TokenType.IDENTIFIER or self.tokens[0].value == "(":
+                while self.tokens.peek().type == TokenType.IDENTIFIER or self.tokens.peek().value == "(":
                     self.Vb()
                     n += 1
-                if self.tokens[0].value != "=":
-                    print("Parsing error at Db #2")
-                self.tokens.pop(0)
+                if self.tokens.peek().value != "=":
+                    self.report("Parsing error at Db #2")
+                self.tokens.advance()
                 self.E()
                 self.ast.append(Node(NodeType.fcn_form, "fcn_form", n + 1))
-            elif self.tokens[1].value == "=":
-                self.ast.append(Node(NodeType.identifier, self.tokens[0].value, 0))
-                self.tokens.pop(0)
-                self.tokens.pop(0)
+            elif self.tokens.peek(1).value == "=":
+                self.ast.append(Node(NodeType.identifier, self.tokens.peek().value, 0))
+                self.tokens.advance()
+                self.tokens.advance()
                 self.E()
                 self.ast.append(Node(NodeType.equal, "=", 2))
-            elif self.tokens[1].value == ",":
+            elif self.tokens.peek(1).value == ",":
                 self.Vl()
-                if self.tokens[0].value != "=":
-                    print("Parsing error at Db")
-                self.tokens.pop(0)
+                if self.tokens.peek().value != "=":
+                    self.report("Parsing error at Db")
+                self.tokens.advance()
                 self.E()
                 self.ast.append(Node(NodeType.equal, "=", 2))
 
     def Vb(self):
-        if self.tokens[0].type == TokenType.PUNCTUATION and self.tokens[0].value == "(":
-            self.tokens.pop(0)
+        if self.tokens.peek().type == TokenType.PUNCTUATION and self.tokens.peek().value == "(":
+            self.tokens.advance()
             isVl = False
-            if self.tokens[0].type == TokenType.IDENTIFIER:
+            if self.tokens.peek().type == TokenType.IDENTIFIER:
                 self.Vl()
                 isVl = True
-            if self.tokens[0].value != ")":
-                print("Parse error unmatch )")
-            self.tokens.pop(0)
+            if self.tokens.peek().value != ")":
+                self.report("Parse error unmatch )")
+            self.tokens.advance()
             if not isVl:
                 self.ast.append(Node(NodeType.empty_params, "()", 0))
-        elif self.tokens[0].type == TokenType.IDENTIFIER:
-            self.ast.append(Node(NodeType.identifier, self.tokens[0].value, 0))
-            self.tokens.pop(0)
+        elif self.tokens.peek().type == TokenType.IDENTIFIER:
+            self.ast.append(Node(NodeType.identifier, self.tokens.peek().value, 0))
+            self.tokens.advance()
 
     def Vl(self):
         n = 0
         while True:
             if n > 0:
-                self.tokens.pop(0)
-            if not self.tokens[0].type == TokenType.IDENTIFIER:
-                print("Parse error: an identifier was expected")
-            self.ast.append(Node(NodeType.identifier, self.tokens[0].value, 0))
-            self.tokens.pop(0)
+                self.tokens.advance()
+            if not self.tokens.peek().type == TokenType.IDENTIFIER:
+                self.report("Parse error: an identifier was expected")
+            self.ast.append(Node(NodeType.identifier, self.tokens.peek().value, 0))
+            self.tokens.advance()
             n += 1
-            if self.tokens[0].value != ",":
+            if self.tokens.peek().value != ",":
                 break
         if n > 1:
             self.ast.append(Node(NodeType.comma, ",", n))
@@ -0,0 +1,45 @@
+from collections import deque
+
+from LexicalAnalyzer.lexical_analyzer import TokenType, Token
+
+
+class TokenStream:
+    """
+    Cursor over the token sequence consumed by the Parser.
+    Tokens are pulled from any iterable (a list from tokenize() or the generator returned
+    by iter_tokens()) only when the parser looks at them. At most the tokens inside the
+    lookahead window are buffered, so peeking and consuming are O(1) and memory does not
+    grow with the length of the input. Reading past the last token keeps returning an END
+    token, which means callers never need to append their own terminator.
+    Attributes:
+        tokens (iterator): The source the tokens are read from
+        lookahead (deque): Tokens that have been peeked at but not consumed yet
+    Methods:
+        peek(offset=0): Returns the token `offset` places ahead of the cursor without consuming it
+        advance(): Consumes and returns the token under the cursor
+        remaining(): Consumes and returns all the tokens that have not been read yet
+    """
+    def __init__(self, tokens):
+        self.tokens = iter(tokens)
+        self.lookahead = deque()
+        self.end = Token(TokenType.END, "EOF")
+
+    def peek(self, offset=0):
+        while len(self.lookahead) <= offset:
+            token = next(self.tokens, None)
+            if token is None:
+                return self.end
+            self.lookahead.append(token)
+        return self.lookahead[offset]
+
+    def advance(self):
+        token = self.peek()
+        if self.lookahead:
+            self.lookahead.popleft()
+        return token
+
+    def remaining(self):
+        tokens = list(self.lookahead)
+        tokens.extend(self.tokens)
+        self.lookahead.clear()
+        return tokens
@@ -0,0 +1,17 @@
+import socket
+
+# Kept apart from rpal_server so that clients start without importing the interpreter
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7878
+
+# Optimization pass flags a request may carry; the server rejects any it does not know
+PASS_FLAGS = ("--inline", "--fold", "--dce")
+
+
+def connect(socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Opens a client connection to a server started with the same arguments."""
+    if socket_path is None:
+        return socket.create_connection((host, port))
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    client.connect(socket_path)
+    return client
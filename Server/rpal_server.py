@@ -0,0 +1,105 @@
+import json
+import os
+import socket
+import socketserver
+import stat
+import time
+
+from Batch.batch_runner import DEFAULT_TIMEOUT, PASSES, ProgramTimeout, run_source, time_limit
+from Server.rpal_client import DEFAULT_HOST, DEFAULT_PORT
+
+# A forked child per connection isolates requests from each other and from the server; where
+# fork is unavailable connections are served by threads, and timeouts are not enforced
+FORKING = hasattr(os, "fork")
+
+
+def handle_request(request):
+    """Runs one decoded request and returns the JSON-ready response."""
+    source = request.get("source")
+    if not isinstance(source, str):
+        return {"status": "error", "error": "request has no 'source' string"}
+    passes = request.get("passes", [])
+    if not isinstance(passes, list) or not all(isinstance(flag, str) for flag in passes):
+        return {"status": "error", "error": "'passes' must be a list of strings"}
+    unknown = set(passes) - {flag for flag, _ in PASSES}
+    if unknown:
+        return {"status": "error", "error": f"unknown passes: {', '.join(sorted(unknown))}"}
+    passes = [flag for flag, _ in PASSES if flag in passes]
+    timeout = request.get("timeout", DEFAULT_TIMEOUT)
+    if timeout is not None and (type(timeout) not in (int, float) or timeout < 0):
+        return {"status": "error", "error": "'timeout' must be a non-negative number of seconds"}
+    response = {"status": None}
+    start = time.perf_counter()
+    try:
+        # Threads cannot take SIGALRM, so only forked children enforce the timeout
+        with time_limit(timeout if FORKING else None):
+            response["result"] = run_source(source, passes, bool(request.get("memoize")))
+        response["status"] = "ok"
+    except ProgramTimeout:
+        response["status"] = "timeout"
+        response["error"] = f"timed out after {timeout:g}s"
+    except Exception as e:
+        response["status"] = "error"
+        response["error"] = f"{type(e).__name__}: {e}"
+    response["seconds"] = round(time.perf_counter() - start, 6)
+    return response
+
+
+class RequestHandler(socketserver.StreamRequestHandler):
+    """
+    Serves one connection of the RPAL server.
+    The protocol is JSON lines in both directions: each line the client sends is an object with
+    the program 'source' and optionally 'passes' (a list of '--inline', '--fold', '--dce'),
+    'memoize' and 'timeout' in seconds (0 for none). Each request is answered by one line with
+    a 'status' ('ok', 'error' or 'timeout'), the 'result' or the 'error', and 'seconds'. A
+    connection may carry any number of requests; it ends when the client closes it.
+    Methods:
+        handle(): Answers the requests of the connection until it is closed
+    """
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                response = handle_request(request) if isinstance(request, dict) else \
+                    {"status": "error", "error": "request is not a JSON object"}
+            except ValueError as e:
+                response = {"status": "error", "error": f"invalid request: {e}"}
+            self.wfile.write((json.dumps(response) + "\n").encode())
+            self.wfile.flush()
+
+
+if FORKING:
+    class TCPServer(socketserver.ForkingMixIn, socketserver.TCPServer):
+        allow_reuse_address = True
+
+    class UnixServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+        pass
+else:
+    class TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+        allow_reuse_address = True
+        daemon_threads = True
+
+    UnixServer = None
+
+
+def warm_up():
+    # Touches every stage once, so the first request does not pay for lazy initialization
+    run_source("let rec f n = n eq 0 -> 'ok' | f (n - 1) in f 1", [flag for flag, _ in PASSES], True)
+
+
+def get_server(socket_path=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """Returns a warmed-up server bound to a Unix socket when socket_path is given, otherwise to host:port."""
+    warm_up()
+    if socket_path is None:
+        return TCPServer((host, port), RequestHandler)
+    if UnixServer is None or not hasattr(socket, "AF_UNIX"):
+        raise OSError("Unix domain sockets are not supported on this platform")
+    # A socket file left by a server that did not shut down cleanly would make bind fail;
+    # anything else at that path is not ours to delete
+    if os.path.lexists(socket_path):
+        if not stat.S_ISSOCK(os.lstat(socket_path).st_mode):
+            raise OSError(f"{socket_path} exists and is not a socket")
+        os.remove(socket_path)
+    return UnixServer(socket_path, RequestHandler)
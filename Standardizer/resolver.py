@@ -0,0 +1,53 @@
+from Parser.node import NodeType
+
+
+class Resolver:
+    """
+    Lexical addressing pass over a standardized AST.
+    In the standardized tree every variable is bound by a lambda, so the binding site of each
+    identifier is known before execution. This pass walks the tree keeping the parameter lists
+    of the enclosing lambdas, and annotates every identifier that is used (not declared) with
+    its address: the number of frames to walk up from the current one, and the slot of the
+    variable in that frame. Identifiers bound by no enclosing lambda are left without an
+    address; they name builtins.
+    Attributes:
+        scopes (list): Parameter names of the enclosing lambdas, innermost last
+    Methods:
+        resolve(ast): Annotates the identifiers of a standardized AST and returns it
+        resolve_node(node): Annotates the identifiers under node
+        get_parameters(node): Returns the names bound by a lambda's parameter node
+        get_address(name): Returns the (depth, slot) of name in the current scopes, or None
+    """
+    def __init__(self):
+        self.scopes = []
+
+    def resolve(self, ast):
+        if ast.get_root():
+            self.resolve_node(ast.get_root())
+        return ast
+
+    def resolve_node(self, node):
+        if node.get_data() == "lambda":
+            parameter, body = node.get_children()
+            self.scopes.append(self.get_parameters(parameter))
+            self.resolve_node(body)
+            self.scopes.pop()
+        elif node.get_type() == NodeType.identifier:
+            node.set_address(self.get_address(node.get_value()))
+        else:
+            for child in node.get_children():
+                self.resolve_node(child)
+
+    @staticmethod
+    def get_parameters(node):
+        if node.get_data() == ",":
+            return [child.get_value() for child in node.get_children()]
+        return [node.get_value()]
+
+    def get_address(self, name):
+        for depth, names in enumerate(reversed(self.scopes)):
+            # A name repeated in one parameter list is bound to its last position
+            for slot in range(len(names) - 1, -1, -1):
+                if names[slot] == name:
+                    return depth, slot
+        return None
@@ -1,38 +1,10 @@
-from enum import Enum, auto
-
-class NodeType(Enum):
-    let = auto()
-    fcn_form = auto()
-    identifier = auto()
-    integer = auto()
-    string = auto()
-    where = auto()
-    gamma = auto()
-    lambda_expr = auto()
-    tau = auto()
-    rec = auto()
-    aug = auto()
-    conditional = auto()
-    op_or = auto()
-    op_and = auto()
-    op_not = auto()
-    op_compare = auto()
-    op_plus = auto()
-    op_minus = auto()
-    op_neg = auto()
-    op_mul = auto()
-    op_div = auto()
-    op_pow = auto()
-    at = auto()
-    true_value = auto()
-    false_value = auto()
-    nil = auto()
-    dummy = auto()
-    within = auto()
-    and_op = auto()
-    equal = auto()
-    comma = auto()
-    empty_params = auto()
+from Parser.node import NodeType
+
+# Parser node kinds that become leaves of the standardizer tree
+LEAF_TYPES = {
+    NodeType.identifier, NodeType.integer, NodeType.string, NodeType.true_value,
+    NodeType.false_value, NodeType.nil, NodeType.dummy, NodeType.empty_params
+}
 
 # Standardizer Node class (different from Parser Node)
 class StandardizerNode:
@@ -42,7 +14,10 @@ class StandardizerNode:
     Each node contains data (operator/value), maintains parent-child relationships, tracks depth in the tree,
     and can transform itself and its children according to standardization rules.
     Attributes:
-        data: The data/value stored in this node (operator, identifier, literal, etc.)
+        data: The operator label stored in this node (None for leaf nodes)
+        type (NodeType): The kind of a leaf node (identifier, integer, string, ...), None otherwise
+        value: The raw token value of a leaf node, None otherwise
+        address (tuple): (depth, slot) of the binding an identifier refers to, set by the Resolver
         depth (int): The depth of this node in the tree (root has depth 0)
         parent (StandardizerNode): Reference to the parent node
         children (list): List of child nodes
@@ -50,6 +25,10 @@ class StandardizerNode:
     Methods:
         set_data(data): Sets the data value for this node
         get_data(): Returns the data value of this node
+        get_type(): Returns the leaf kind of this node
+        get_value(): Returns the raw leaf value of this node
+        get_address(): Returns the lexical address of an identifier
+        get_label(): Returns the display label used when printing the tree
         get_degree(): Returns the number of children (degree of the node)
         get_children(): Returns the list of child nodes
         set_depth(depth): Sets the depth of this node in the tree
@@ -69,6 +48,9 @@ class StandardizerNode:
     """
     def __init__(self):
         self.data = None
+        self.type = None
+        self.value = None
+        self.address = None
         self.depth = 0
         self.parent = None
         self.children = []
@@ -80,6 +62,31 @@ class StandardizerNode:
     def get_data(self):
         return self.data
 
+    def set_type(self, node_type):
+        self.type = node_type
+
+    def get_type(self):
+        return self.type
+
+    def set_value(self, value):
+        self.value = value
+
+    def get_value(self):
+        return self.value
+
+    def set_address(self, address):
+        self.address = address
+
+    def get_address(self):
+        return self.address
+
+    def get_label(self):
+        if self.type is None:
+            return str(self.data)
+        if self.type == NodeType.empty_params:
+            return self.value
+        return f"<{self.type.name.upper()}:{self.value}>"
+
     def get_degree(self):
         return len(self.children)
     
@@ -223,6 +230,8 @@ class StandardizerNode:
                 X = self.children[0].children[0]
                 E = self.children[0].children[1]
                 F = NodeFactory.get_node_with_parent(X.get_data(), self.depth + 1, self, X.children, True)
+                F.set_type(X.get_type())
+                F.set_value(X.get_value())
                 G = NodeFactory.get_node_with_parent("gamma", self.depth + 1, self, [], True)
                 Y = NodeFactory.get_node_with_parent("<Y*>", self.depth + 2, G, [], True)
                 L = NodeFactory.get_node_with_parent("lambda", self.depth + 2, G, [], True)
@@ -261,39 +270,54 @@ class NodeFactory:
         node.is_standardized = is_standardized
         return node
 
+    @staticmethod
+    def get_leaf_node(node_type, value, depth):
+        node = StandardizerNode()
+        node.set_type(node_type)
+        node.set_value(value)
+        node.set_depth(depth)
+        node.children = []
+        return node
+
 class ASTFactory:
     def __init__(self):
         pass
 
-    def get_abstract_syntax_tree(self, data):
-        if not data:
+    def get_abstract_syntax_tree(self, nodes):
+        """
+        Builds the standardizer tree straight from the parser's postfix node stack.
+        Leaves keep their NodeType and raw value, so no dotted string form is produced
+        or re-parsed; the dotted text is only rendered on demand by print_ast().
+        Args:
+            nodes (list[Node]): The AST returned by Parser.parse(), children before parents.
+        Returns:
+            AST: The tree rooted at the last node of the stack, or None if it is empty.
+        """
+        if not nodes:
             return None
-            
-        root = NodeFactory.get_node(data[0], 0)
-        previous_node = root
-        current_depth = 0
-
-        for s in data[1:]:
-            i = 0
-            d = 0
-
-            while i < len(s) and s[i] == '.':
-                d += 1
-                i += 1
-
-            current_node = NodeFactory.get_node(s[i:], d)
-
-            if current_depth < d:
-                previous_node.children.append(current_node)
-                current_node.set_parent(previous_node)
-            else:
-                while previous_node.get_depth() != d:
-                    previous_node = previous_node.get_parent()
-                previous_node.get_parent().children.append(current_node)
-                current_node.set_parent(previous_node.get_parent())
-
-            previous_node = current_node
-            current_depth = d
+
+        stack = []
+        for node in nodes:
+            if node.type in LEAF_TYPES:
+                stack.append(NodeFactory.get_leaf_node(node.type, node.value, 0))
+                continue
+
+            data = "function_form" if node.type == NodeType.fcn_form else node.value
+            current_node = NodeFactory.get_node(data, 0)
+            if node.no_of_children:
+                current_node.children = stack[-node.no_of_children:]
+                del stack[-node.no_of_children:]
+                for child in current_node.children:
+                    child.set_parent(current_node)
+            stack.append(current_node)
+
+        root = stack[-1]
+        pending = [root]
+        while pending:
+            node = pending.pop()
+            for child in node.children:
+                child.set_depth(node.depth + 1)
+                pending.append(child)
         return AST(root)
 
 class AST:
@@ -311,7 +335,7 @@ class AST:
             self.root.standardize()
 
     def pre_order_traverse(self, node, i):
-        print("." * i + str(node.get_data()))
+        print("." * i + node.get_label())
         for child in node.children:
             self.pre_order_traverse(child, i + 1)
 
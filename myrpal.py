@@ -1,30 +1,84 @@
+import io
 import sys
-from LexicalAnalyzer.lexical_analyzer import tokenize
+from LexicalAnalyzer.lexical_analyzer import iter_tokens
 from Parser.parser import Parser
 from Standardizer.standardizer import ASTFactory  # Import the standardizer
 from CSEMachine.CSEM import CSEMachineFactory  # Import the CSE machine
+from CSEMachine.memo_cache import MemoCache
+from Cache.program_cache import ProgramCache
+from rpal import PASSES, Program, optimize
+
+# Flags that change the compiled program, and so are part of its cache key; one per
+# optimization pass of the library pipeline, in the order it applies them
+PASS_FLAGS = tuple("--" + name for name in PASSES)
+
+def run_program(program, memoize):
+    try:
+        memo = MemoCache() if memoize else None
+        result = program.get_answer(memo)
+        print("Result :", result)
+        if memo is not None:
+            print(f"Memoization: {memo.hits} hits, {memo.misses} misses, {memo.evictions} evictions",
+                  file=sys.stderr)
+    except Exception as e:
+        print("Error during CSE machine execution:", e)
+        import traceback
+        traceback.print_exc()
 
 def main():
     if len(sys.argv) < 2:
-        print("Usage: python myrpal.py <input_file> [-ast] [-st]")
+        print("Usage: python myrpal.py <input_file | -> [-ast] [-st] "
+              + "".join(f"[{flag}] " for flag in PASS_FLAGS) + "[--memoize] [--cache]")
         return
 
     file_path = sys.argv[1]
     show_ast = "-ast" in sys.argv
     show_st = "-st" in sys.argv
+    passes = [flag[2:] for flag in PASS_FLAGS if flag in sys.argv]
+    memoize = "--memoize" in sys.argv
+    use_cache = "--cache" in sys.argv and not show_ast and not show_st
 
-    try:
-        with open(file_path, 'r') as file:
-            source = file.read()
-    except FileNotFoundError:
-        print(f"Error: File '{file_path}' not found.")
-        return
+    # "-" reads the program from stdin
+    if file_path == "-":
+        source = sys.stdin
+    else:
+        try:
+            source = open(file_path, 'r')
+        except FileNotFoundError:
+            print(f"Error: File '{file_path}' not found.")
+            return
+
+    # A cached program goes straight to execution; the whole source is read to compute its key
+    if use_cache:
+        try:
+            text = source.read()
+        finally:
+            if source is not sys.stdin:
+                source.close()
+        cache = ProgramCache()
+        cache_key = cache.get_key(text, ["--" + name for name in passes])
+        cached = cache.load(cache_key)
+        if cached is not None:
+            run_program(Program(*cached), memoize)
+            return
+        source = io.StringIO(text)
+
+    # Diagnostics are printed as they are found and also kept: a program that had any is not
+    # cached, since a cache hit would run it without repeating them
+    messages = []
+
+    def report(message):
+        messages.append(message)
+        print(message)
 
     try:
-        # Tokenize and parse
-        tokens = tokenize(source)
-        parser = Parser(tokens)
-        ast_nodes = parser.parse()
+        # Tokenize lazily while parsing, so the input is read as the parser needs it
+        parser = Parser(iter_tokens(source), report=report)
+        try:
+            ast_nodes = parser.parse()
+        finally:
+            if source is not sys.stdin:
+                source.close()
 
         if ast_nodes is None:
             print("Parsing failed.")
@@ -37,13 +91,9 @@ def main():
                 print(line)
             return
 
-        # Convert to standardizer format and standardize
-        # Convert parser AST to string format
-        string_ast = parser.convert_ast_to_string_ast()
-        
-        # Create standardizer AST from string representation
+        # Build the standardizer AST directly from the parser nodes
         ast_factory = ASTFactory()
-        standardizer_ast = ast_factory.get_abstract_syntax_tree(string_ast)
+        standardizer_ast = ast_factory.get_abstract_syntax_tree(ast_nodes)
         
         if not standardizer_ast:
             print("Failed to create standardizer AST.")
@@ -51,6 +101,9 @@ def main():
             
         # Standardize the AST
         standardizer_ast.standardize()
+
+        # Optional optimization passes over the standardized AST; reports go to stderr
+        optimize(standardizer_ast, passes, report=lambda summary: print(summary, file=sys.stderr))
      
         # Show standardized AST if requested
         if show_st:
@@ -62,14 +115,16 @@ def main():
         if not show_ast and not show_st:
             # Only show result when not showing intermediate representations
             try:
-                cse_factory = CSEMachineFactory()
-                cse_machine = cse_factory.get_cse_machine(standardizer_ast)
-                result = cse_machine.get_answer()
-                print("Result :", result)
+                cse_factory = CSEMachineFactory(report=report)
+                program = Program(cse_factory.get_control(standardizer_ast), cse_factory.get_environment())
             except Exception as e:
                 print("Error during CSE machine execution:", e)
                 import traceback
                 traceback.print_exc()
+                return
+            run_program(program, memoize)
+            if use_cache and not messages:
+                cache.store(cache_key, program.control, program.environment)
         else:
             # When showing AST or ST, also execute and show result
             try:
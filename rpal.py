@@ -0,0 +1,158 @@
+from LexicalAnalyzer.lexical_analyzer import iter_tokens
+from Parser.parser import Parser
+from Standardizer.standardizer import ASTFactory
+from CSEMachine.CSEM import Bool, CSEMachine, CSEMachineFactory, Dummy, Int, Str, Tup
+from CSEMachine.memo_cache import MemoCache
+from Optimizer.constant_folder import ConstantFolder
+from Optimizer.inliner import Inliner
+from Optimizer.dead_code import DeadCodeEliminator
+
+# Library interface to the interpreter: each phase of myrpal.py as a function, and compiled
+# programs that can be run any number of times. Nothing here writes to stdout.
+
+# Optimization passes by name, in the order they are applied
+PASSES = {"inline": Inliner, "fold": ConstantFolder, "dce": DeadCodeEliminator}
+
+# What the machine raises when a program goes wrong (division by zero, a bad tuple index, ...)
+EVALUATION_ERRORS = (ArithmeticError, LookupError, TypeError, ValueError, AttributeError, RecursionError)
+
+# What the lexer and the tree building passes raise on malformed source (a stray character, a
+# construct with missing parts, ...)
+COMPILE_ERRORS = (SyntaxError, LookupError, TypeError, ValueError, AttributeError)
+
+
+class RPALError(Exception):
+    pass
+
+
+class CompileError(RPALError):
+    pass
+
+
+class EvaluationError(RPALError):
+    pass
+
+
+def tokenize(source):
+    """Returns the tokens of source, a string or a text stream, ending with an END token."""
+    return list(iter_tokens(source))
+
+
+def parse(source):
+    """Returns the postfix AST node list of source; raises CompileError with the parser's messages."""
+    messages = []
+    try:
+        nodes = Parser(iter_tokens(source), report=messages.append).parse()
+    except COMPILE_ERRORS as e:
+        raise CompileError(f"Parsing failed: {e}") from e
+    if nodes is None or messages:
+        raise CompileError("\n".join(messages) or "Parsing failed.")
+    return nodes
+
+
+def standardize(nodes):
+    """Builds the tree of a parsed program and returns it standardized."""
+    try:
+        ast = ASTFactory().get_abstract_syntax_tree(nodes)
+        if ast:
+            ast.standardize()
+    except COMPILE_ERRORS as e:
+        raise CompileError(f"Standardizing failed: {type(e).__name__}: {e}") from e
+    if not ast:
+        raise CompileError("Failed to create standardizer AST.")
+    return ast
+
+
+def optimize(ast, passes=(), report=None):
+    """Applies the named passes ('inline', 'fold', 'dce') in their fixed order and returns the AST.
+    report, when given, receives each pass's summary of what it did."""
+    unknown = set(passes) - set(PASSES)
+    if unknown:
+        raise ValueError(f"Unknown optimization passes: {', '.join(sorted(unknown))}")
+    for name, optimizer in PASSES.items():
+        if name in passes:
+            instance = optimizer()
+            try:
+                instance.optimize(ast)
+            except COMPILE_ERRORS as e:
+                raise CompileError(f"Optimization pass '{name}' failed: {type(e).__name__}: {e}") from e
+            if report is not None:
+                report(instance.get_report())
+    return ast
+
+
+def compile(source, passes=()):
+    """Compiles source, a string or a text stream, into a reusable Program."""
+    ast = optimize(standardize(parse(source)), passes)
+    return Program.from_ast(ast)
+
+
+def run(source, passes=(), memoize=False):
+    """Compiles and runs source once and returns its value as a Python object."""
+    return compile(source, passes).run(memoize)
+
+
+def get_python_value(value):
+    """Converts a machine value: integers, truth values and strings to int, bool and str, tuples to
+    tuples, dummy to None. Functions are returned as machine closures."""
+    value_type = type(value)
+    if value_type is Int or value_type is Bool or value_type is Str:
+        return value.get_data()
+    elif value_type is Tup:
+        return tuple(get_python_value(item) for item in value.get_items())
+    elif value_type is Dummy:
+        return None
+    return value
+
+
+class Program:
+    """
+    A compiled RPAL program.
+    Holds the control structures built by CSEMachineFactory: the initial control stack and the
+    root environment. Running never changes either of them (instruction arrays, literals and
+    builtins are immutable, and the root frame stays empty), so one Program can be run any number of
+    times, from several threads, without compiling again; every run gets its own machine.
+    Attributes:
+        control (list): The initial control stack, which each machine receives a copy of
+        environment (list): The root environment frame the program's code starts in
+    Methods:
+        from_ast(ast): Builds the Program of a standardized AST
+        get_machine(memo): Returns a fresh CSEMachine ready to run the program
+        evaluate(memo): Runs the program on a fresh machine and returns the machine and the result
+        run(memoize): Runs the program and returns its value as a Python object
+        get_answer(memo): Runs the program and returns its value formatted as RPAL output
+    """
+    def __init__(self, control, environment):
+        self.control = control
+        self.environment = environment
+
+    @classmethod
+    def from_ast(cls, ast):
+        messages = []
+        factory = CSEMachineFactory(report=messages.append)
+        try:
+            control = factory.get_control(ast)
+        except COMPILE_ERRORS as e:
+            raise CompileError(f"Code generation failed: {type(e).__name__}: {e}") from e
+        if messages:
+            raise CompileError("\n".join(messages))
+        return cls(control, factory.get_environment())
+
+    def get_machine(self, memo=None):
+        return CSEMachine(list(self.control), [], self.environment, memo)
+
+    def evaluate(self, memo):
+        machine = self.get_machine(memo)
+        try:
+            machine.execute()
+            return machine, machine.stack[-1]
+        except EVALUATION_ERRORS as e:
+            raise EvaluationError(f"{type(e).__name__}: {e}") from e
+
+    def run(self, memoize=False):
+        _, value = self.evaluate(MemoCache() if memoize else None)
+        return get_python_value(value)
+
+    def get_answer(self, memo=None):
+        machine, value = self.evaluate(memo)
+        return machine.get_value(value)
@@ -0,0 +1,59 @@
+import json
+import sys
+import time
+from Batch.batch_runner import BatchRunner, DEFAULT_TIMEOUT, PASSES
+
+# Options that take no value
+FLAGS = {"--unordered", "--memoize"} | {flag for flag, _ in PASSES}
+
+USAGE = ("Usage: python rpalbatch.py <file | directory | @manifest>... [--jobs N] [--timeout SECONDS] "
+         "[--unordered] [--inline] [--fold] [--dce] [--memoize]")
+
+def main():
+    paths = []
+    jobs = None
+    timeout = DEFAULT_TIMEOUT
+    flags = set()
+    args = iter(sys.argv[1:])
+    try:
+        for arg in args:
+            if arg == "--jobs":
+                jobs = int(next(args))
+                if jobs < 1:
+                    raise ValueError(f"--jobs must be at least 1, not {jobs}")
+            elif arg == "--timeout":
+                # 0 disables the limit
+                timeout = float(next(args)) or None
+            elif arg in FLAGS:
+                flags.add(arg)
+            elif arg.startswith("-"):
+                raise ValueError(f"unknown option {arg}")
+            else:
+                paths.append(arg)
+    except (StopIteration, ValueError):
+        print(USAGE)
+        return
+    if not paths:
+        print(USAGE)
+        return
+
+    runner = BatchRunner(
+        jobs=jobs,
+        timeout=timeout,
+        ordered="--unordered" not in flags,
+        passes=[flag for flag, _ in PASSES if flag in flags],
+        memoize="--memoize" in flags
+    )
+
+    # One JSON object per line, written as each program finishes; the summary goes to stderr
+    counts = {"ok": 0, "error": 0, "timeout": 0}
+    start = time.perf_counter()
+    for record in runner.run(paths):
+        counts[record["status"]] += 1
+        print(json.dumps(record), flush=True)
+    elapsed = time.perf_counter() - start
+    print(f"{sum(counts.values())} programs: {counts['ok']} ok, {counts['error']} errors, "
+          f"{counts['timeout']} timeouts in {elapsed:.2f}s with {runner.jobs} jobs", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
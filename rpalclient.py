@@ -0,0 +1,66 @@
+import json
+import sys
+from Server.rpal_client import DEFAULT_HOST, DEFAULT_PORT, PASS_FLAGS, connect
+
+USAGE = ("Usage: python rpalclient.py <input_file | -> [--socket PATH | --host HOST --port N] "
+         "[--timeout SECONDS] [--inline] [--fold] [--dce] [--memoize]")
+
+def main():
+    if len(sys.argv) < 2:
+        print(USAGE)
+        return
+
+    file_path = sys.argv[1]
+    socket_path = None
+    host = DEFAULT_HOST
+    port = DEFAULT_PORT
+    request = {"passes": []}
+    args = iter(sys.argv[2:])
+    try:
+        for arg in args:
+            if arg == "--socket":
+                socket_path = next(args)
+            elif arg == "--host":
+                host = next(args)
+            elif arg == "--port":
+                port = int(next(args))
+            elif arg == "--timeout":
+                request["timeout"] = float(next(args))
+            elif arg == "--memoize":
+                request["memoize"] = True
+            elif arg in PASS_FLAGS:
+                request["passes"].append(arg)
+            else:
+                raise ValueError(f"unknown option {arg}")
+    except (StopIteration, ValueError):
+        print(USAGE)
+        return
+
+    # "-" reads the program from stdin
+    if file_path == "-":
+        request["source"] = sys.stdin.read()
+    else:
+        try:
+            with open(file_path, 'r') as source:
+                request["source"] = source.read()
+        except FileNotFoundError:
+            print(f"Error: File '{file_path}' not found.")
+            return
+
+    try:
+        with connect(socket_path, host, port) as client:
+            client.sendall((json.dumps(request) + "\n").encode())
+            with client.makefile("r") as reply:
+                response = json.loads(reply.readline())
+    except (OSError, ValueError) as e:
+        print("Error talking to the RPAL server:", e)
+        sys.exit(2)
+
+    if response["status"] == "ok":
+        print("Result :", response["result"])
+    else:
+        print("Error during execution:", response["error"])
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
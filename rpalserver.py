@@ -0,0 +1,42 @@
+import os
+import signal
+import sys
+from Server.rpal_server import DEFAULT_HOST, DEFAULT_PORT, get_server
+
+USAGE = "Usage: python rpalserver.py [--socket PATH | --host HOST --port N]"
+
+def main():
+    socket_path = None
+    host = DEFAULT_HOST
+    port = DEFAULT_PORT
+    args = iter(sys.argv[1:])
+    try:
+        for arg in args:
+            if arg == "--socket":
+                socket_path = next(args)
+            elif arg == "--host":
+                host = next(args)
+            elif arg == "--port":
+                port = int(next(args))
+            else:
+                raise ValueError(arg)
+    except (StopIteration, ValueError):
+        print(USAGE)
+        return
+
+    server = get_server(socket_path, host, port)
+    address = socket_path or f"{host}:{port}"
+    print(f"RPAL server listening on {address}", file=sys.stderr, flush=True)
+    # Stop on SIGTERM as on Ctrl+C, so the socket file is removed either way
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if socket_path is not None and os.path.exists(socket_path):
+            os.remove(socket_path)
+
+if __name__ == "__main__":
+    main()